@@ -31,14 +31,16 @@ def upgrade() -> None:
     )
     op.create_index(op.f("ix_import_datasets_name"), "import_datasets", ["name"], unique=False)
 
-    op.execute("CREATE TYPE importrunstatus AS ENUM ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED')")
+    # DRAFT (introduced with 004) is declared up front so no later revision needs the
+    # non-transactional ALTER TYPE ... ADD VALUE
+    op.execute("CREATE TYPE importrunstatus AS ENUM ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'DRAFT')")
     op.create_table(
         "import_runs",
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
         sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
         sa.Column("dataset_id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("status", sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="importrunstatus"), nullable=False),
+        sa.Column("status", sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", "DRAFT", name="importrunstatus"), nullable=False),
         sa.Column("file_path", sa.String(length=1024), nullable=True),
         sa.Column("progress_percent", sa.Integer(), nullable=False, server_default="0"),
         sa.Column("total_rows", sa.Integer(), nullable=True),
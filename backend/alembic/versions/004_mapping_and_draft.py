@@ -22,9 +22,10 @@ def upgrade() -> None:
         "import_datasets",
         sa.Column("mapping_json", JSONB(astext_type=sa.Text()), nullable=True),
     )
-    op.execute("ALTER TYPE importrunstatus ADD VALUE IF NOT EXISTS 'DRAFT'")
+    # DRAFT is part of importrunstatus since 002; databases created before that change
+    # already gained it here via ALTER TYPE ... ADD VALUE.
 
 
 def downgrade() -> None:
     op.drop_column("import_datasets", "mapping_json")
-    # Note: DRAFT enum value cannot be removed from PostgreSQL without recreating the type.
+    # DRAFT belongs to importrunstatus as created by 002 and is dropped with it.
@@ -29,7 +29,15 @@ def upgrade() -> None:
         "import_runs",
         sa.Column("row_limit_exceeded", sa.Boolean(), nullable=False, server_default="false"),
     )
-    op.create_index("ix_import_runs_file_sha256", "import_runs", ["file_sha256"], unique=False)
+    # import_runs is populated by now: build without blocking writes (cannot run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_file_sha256",
+            "import_runs",
+            ["file_sha256"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
 
 
 def downgrade() -> None:
@@ -37,7 +37,6 @@ def upgrade() -> None:
         sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("ix_organizations_name", "organizations", ["name"], unique=False)
 
     # Create organization_members table
     op.create_table(
@@ -51,13 +50,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
-        "ix_organization_members_org_user",
-        "organization_members",
-        ["org_id", "user_id"],
-        unique=True,
-    )
-    op.create_index("ix_organization_members_user", "organization_members", ["user_id"], unique=False)
 
     # Create organization_invites table
     op.create_table(
@@ -85,14 +77,6 @@ def upgrade() -> None:
         "users",
         sa.Column("active_org_id", postgresql.UUID(as_uuid=True), nullable=True),
     )
-    op.create_foreign_key(
-        "fk_users_active_org_id",
-        "users",
-        "organizations",
-        ["active_org_id"],
-        ["id"],
-        ondelete="SET NULL",
-    )
 
     # Add org_id to import_datasets (nullable first for migration)
     op.add_column(
@@ -100,92 +84,72 @@ def upgrade() -> None:
         sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=True),
     )
 
-    # Backfill: create personal orgs for existing users with datasets
-    # This is a data migration - we'll create orgs and assign datasets
+    # Backfill: create a personal org for every existing user and assign their datasets.
+    # Set-based so the statement count is constant regardless of how many users exist;
+    # a temporary column carries each user's new org id across the statements.
     connection = op.get_bind()
-    
-    # Get all users who have datasets
-    result = connection.execute(
-        sa.text("""
-            SELECT DISTINCT created_by_user_id 
-            FROM import_datasets 
-            WHERE created_by_user_id IS NOT NULL
-        """)
-    )
-    user_ids = [row[0] for row in result]
-    
-    for user_id in user_ids:
-        # Get user name
-        user_result = connection.execute(
-            sa.text("SELECT name FROM users WHERE id = :user_id"),
-            {"user_id": user_id}
+
+    # Fresh databases (dev, CI) have nothing to backfill
+    has_users = connection.execute(sa.text("SELECT EXISTS (SELECT 1 FROM users)")).scalar()
+    if has_users:
+        # gen_random_uuid() is built in from Postgres 13; pgcrypto provides it on older servers
+        op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+        op.add_column(
+            "users",
+            sa.Column(
+                "tmp_org_id",
+                postgresql.UUID(as_uuid=True),
+                server_default=sa.text("gen_random_uuid()"),
+                nullable=False,
+            ),
         )
-        user_row = user_result.fetchone()
-        if not user_row:
-            continue
-        user_name = user_row[0]
-        
-        # Create personal org
-        import uuid
-        org_id = uuid.uuid4()
         connection.execute(
             sa.text("""
                 INSERT INTO organizations (id, name, created_at, updated_at)
-                VALUES (:org_id, :name, NOW(), NOW())
-            """),
-            {"org_id": org_id, "name": f"{user_name} Workspace"}
+                SELECT tmp_org_id, name || ' Workspace', NOW(), NOW()
+                FROM users
+            """)
         )
-        
-        # Add user as OWNER
         connection.execute(
             sa.text("""
                 INSERT INTO organization_members (id, org_id, user_id, role, created_at)
-                VALUES (:id, :org_id, :user_id, 'OWNER', NOW())
-            """),
-            {"id": uuid.uuid4(), "org_id": org_id, "user_id": user_id}
-        )
-        
-        # Update user's active_org_id
-        connection.execute(
-            sa.text("UPDATE users SET active_org_id = :org_id WHERE id = :user_id"),
-            {"org_id": org_id, "user_id": user_id}
-        )
-        
-        # Assign datasets to org
-        connection.execute(
-            sa.text("UPDATE import_datasets SET org_id = :org_id WHERE created_by_user_id = :user_id"),
-            {"org_id": org_id, "user_id": user_id}
-        )
-    
-    # Create orgs for users without datasets
-    result = connection.execute(
-        sa.text("SELECT id, name FROM users WHERE active_org_id IS NULL")
-    )
-    for row in result:
-        user_id, user_name = row
-        import uuid
-        org_id = uuid.uuid4()
-        connection.execute(
-            sa.text("""
-                INSERT INTO organizations (id, name, created_at, updated_at)
-                VALUES (:org_id, :name, NOW(), NOW())
-            """),
-            {"org_id": org_id, "name": f"{user_name} Workspace"}
+                SELECT gen_random_uuid(), tmp_org_id, id, 'OWNER', NOW()
+                FROM users
+            """)
         )
+        connection.execute(sa.text("UPDATE users SET active_org_id = tmp_org_id"))
         connection.execute(
             sa.text("""
-                INSERT INTO organization_members (id, org_id, user_id, role, created_at)
-                VALUES (:id, :org_id, :user_id, 'OWNER', NOW())
-            """),
-            {"id": uuid.uuid4(), "org_id": org_id, "user_id": user_id}
-        )
-        connection.execute(
-            sa.text("UPDATE users SET active_org_id = :org_id WHERE id = :user_id"),
-            {"org_id": org_id, "user_id": user_id}
+                UPDATE import_datasets d
+                SET org_id = u.tmp_org_id
+                FROM users u
+                WHERE d.created_by_user_id = u.id
+            """)
         )
+        op.drop_column("users", "tmp_org_id")
+
+    # Indexes on the backfilled tables are built once over the loaded rows rather than
+    # maintained row by row during the inserts
+    op.create_index("ix_organizations_name", "organizations", ["name"], unique=False)
+    op.create_index(
+        "ix_organization_members_org_user",
+        "organization_members",
+        ["org_id", "user_id"],
+        unique=True,
+    )
+    op.create_index("ix_organization_members_user", "organization_members", ["user_id"], unique=False)
 
-    # Now make org_id NOT NULL
+    # Now make org_id NOT NULL. Foreign keys are added after the backfill so each is
+    # validated once against the loaded rows instead of per inserted/updated row.
     op.alter_column("import_datasets", "org_id", nullable=False)
+    op.create_foreign_key(
+        "fk_users_active_org_id",
+        "users",
+        "organizations",
+        ["active_org_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
     op.create_foreign_key(
         "fk_import_datasets_org_id",
         "import_datasets",
@@ -194,7 +158,15 @@ def upgrade() -> None:
         ["id"],
         ondelete="CASCADE",
     )
-    op.create_index("ix_import_datasets_org_id", "import_datasets", ["org_id"], unique=False)
+    # import_datasets is populated: build without blocking writes (cannot run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_datasets_org_id",
+            "import_datasets",
+            ["org_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
 
 
 def downgrade() -> None:
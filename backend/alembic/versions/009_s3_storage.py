@@ -20,7 +20,15 @@ def upgrade() -> None:
     op.add_column("import_runs", sa.Column("file_storage", sa.String(16), nullable=False, server_default="disk"))
     op.add_column("import_runs", sa.Column("s3_bucket", sa.String(255), nullable=True))
     op.add_column("import_runs", sa.Column("s3_key", sa.String(1024), nullable=True))
-    op.create_index("ix_import_runs_s3_bucket_key", "import_runs", ["s3_bucket", "s3_key"], unique=False)
+    # import_runs is populated by now: build without blocking writes (cannot run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_s3_bucket_key",
+            "import_runs",
+            ["s3_bucket", "s3_key"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
 
 
 def downgrade() -> None:
@@ -0,0 +1,34 @@
+"""add partial index on import_runs.dlq
+
+Revision ID: 010_dlq_partial_index
+Revises: 009_s3_storage
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010_dlq_partial_index"
+down_revision: Union[str, None] = "009_s3_storage"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only the rare dlq=true rows are indexed, so "WHERE dlq" lookups stay cheap
+    # without paying for an index over every run
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_dlq",
+            "import_runs",
+            ["dlq"],
+            unique=False,
+            postgresql_where=sa.text("dlq"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_runs_dlq", table_name="import_runs")
@@ -0,0 +1,38 @@
+"""widen row counters and row_number columns to BIGINT
+
+Revision ID: 011_bigint_row_counters
+Revises: 010_dlq_partial_index
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011_bigint_row_counters"
+down_revision: Union[str, None] = "010_dlq_partial_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RUN_COUNTERS = ("total_rows", "processed_rows", "success_rows", "error_rows")
+
+
+def _alter_run_counters(type_name: str) -> None:
+    # One ALTER TABLE so import_runs is locked and rewritten once, not once per column
+    clauses = ", ".join(f"ALTER COLUMN {column} TYPE {type_name}" for column in RUN_COUNTERS)
+    op.execute(f"ALTER TABLE import_runs {clauses}")
+
+
+def upgrade() -> None:
+    # Rewrites the tables once now, while they are still small, instead of hitting the
+    # 32-bit ceiling later on a table too large to rewrite
+    _alter_run_counters("BIGINT")
+    op.alter_column("import_records", "row_number", type_=sa.BigInteger(), existing_type=sa.Integer())
+    op.alter_column("import_row_errors", "row_number", type_=sa.BigInteger(), existing_type=sa.Integer())
+
+
+def downgrade() -> None:
+    op.alter_column("import_row_errors", "row_number", type_=sa.Integer(), existing_type=sa.BigInteger())
+    op.alter_column("import_records", "row_number", type_=sa.Integer(), existing_type=sa.BigInteger())
+    _alter_run_counters("INTEGER")
@@ -0,0 +1,86 @@
+"""hash-partition import_records by run_id
+
+Revision ID: 012_partition_import_records
+Revises: 011_bigint_row_counters
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "012_partition_import_records"
+down_revision: Union[str, None] = "011_bigint_row_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+COLUMNS = "id, run_id, row_number, date, campaign, channel, spend, clicks, conversions, created_at"
+
+
+def _record_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("row_number", sa.BigInteger(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("campaign", sa.String(length=512), nullable=False),
+        sa.Column("channel", sa.String(length=255), nullable=False),
+        sa.Column("spend", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("clicks", sa.Integer(), nullable=False),
+        sa.Column("conversions", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["run_id"], ["import_runs.id"], name="import_records_run_id_fkey", ondelete="CASCADE"
+        ),
+    ]
+
+
+def _retire_current_table() -> None:
+    """Move the existing import_records out of the way so its names can be reused."""
+    op.drop_index("ix_import_records_run_id_campaign", table_name="import_records")
+    op.drop_index("ix_import_records_run_id_row_number", table_name="import_records")
+    op.rename_table("import_records", "import_records_old")
+    op.execute("ALTER TABLE import_records_old RENAME CONSTRAINT import_records_pkey TO import_records_old_pkey")
+    op.execute(
+        "ALTER TABLE import_records_old RENAME CONSTRAINT import_records_run_id_fkey TO import_records_old_run_id_fkey"
+    )
+
+
+def _copy_from_old_and_index() -> None:
+    op.execute(f"INSERT INTO import_records ({COLUMNS}) SELECT {COLUMNS} FROM import_records_old")
+    op.drop_table("import_records_old")
+    op.create_index("ix_import_records_run_id_row_number", "import_records", ["run_id", "row_number"], unique=False)
+    op.create_index("ix_import_records_run_id_campaign", "import_records", ["run_id", "campaign"], unique=False)
+
+
+def upgrade() -> None:
+    # Every query on import_records filters by run_id, so hash partitions on it are always
+    # pruned to one and keep each partition's indexes small. The partition key has to be
+    # part of the primary key.
+    _retire_current_table()
+    op.create_table(
+        "import_records",
+        *_record_columns(),
+        sa.PrimaryKeyConstraint("id", "run_id", name="import_records_pkey"),
+        postgresql_partition_by="HASH (run_id)",
+    )
+    for i in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE import_records_p{i} PARTITION OF import_records "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})"
+        )
+    _copy_from_old_and_index()
+
+
+def downgrade() -> None:
+    _retire_current_table()
+    op.create_table(
+        "import_records",
+        *_record_columns(),
+        sa.PrimaryKeyConstraint("id", name="import_records_pkey"),
+    )
+    _copy_from_old_and_index()
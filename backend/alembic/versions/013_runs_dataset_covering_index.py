@@ -0,0 +1,40 @@
+"""make ix_import_runs_dataset_id_created_at a covering, newest-first index
+
+Revision ID: 013_runs_dataset_covering_index
+Revises: 012_partition_import_records
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013_runs_dataset_covering_index"
+down_revision: Union[str, None] = "012_partition_import_records"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Recent-runs listings only need status/progress columns: serve them from the index
+    op.execute("ALTER INDEX ix_import_runs_dataset_id_created_at RENAME TO ix_import_runs_dataset_id_created_at_old")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_dataset_id_created_at",
+            "import_runs",
+            ["dataset_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_include=["status", "progress_percent", "processed_rows", "total_rows"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_import_runs_dataset_id_created_at_old",
+            table_name="import_runs",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_runs_dataset_id_created_at", table_name="import_runs")
+    op.create_index("ix_import_runs_dataset_id_created_at", "import_runs", ["dataset_id", "created_at"], unique=False)
@@ -0,0 +1,38 @@
+"""store import_runs.status as a SMALLINT code instead of the importrunstatus enum
+
+Revision ID: 014_run_status_smallint
+Revises: 013_runs_dataset_covering_index
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "014_run_status_smallint"
+down_revision: Union[str, None] = "013_runs_dataset_covering_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match ImportRunStatusCode in app_shared.models.imports
+STATUS_CODES = {"DRAFT": 0, "QUEUED": 1, "RUNNING": 2, "SUCCEEDED": 3, "FAILED": 4}
+
+
+def upgrade() -> None:
+    # New statuses become a new code instead of ALTER TYPE ... ADD VALUE.
+    # Indexes on status are rebuilt by the type change.
+    cases = " ".join(f"WHEN '{name}' THEN {code}" for name, code in STATUS_CODES.items())
+    op.execute(f"ALTER TABLE import_runs ALTER COLUMN status TYPE SMALLINT USING (CASE status::text {cases} END)")
+    op.execute("ALTER TABLE import_runs ALTER COLUMN status SET DEFAULT 0")
+    op.execute("DROP TYPE importrunstatus")
+
+
+def downgrade() -> None:
+    names = ", ".join(f"'{name}'" for name in STATUS_CODES)
+    cases = " ".join(f"WHEN {code} THEN '{name}'" for name, code in STATUS_CODES.items())
+    op.execute(f"CREATE TYPE importrunstatus AS ENUM ({names})")
+    op.execute("ALTER TABLE import_runs ALTER COLUMN status DROP DEFAULT")
+    op.execute(
+        "ALTER TABLE import_runs ALTER COLUMN status TYPE importrunstatus "
+        f"USING (CASE status {cases} END)::importrunstatus"
+    )
@@ -0,0 +1,26 @@
+"""store import_runs.file_sha256 as the raw 32-byte digest (BYTEA)
+
+Revision ID: 015_sha256_bytea
+Revises: 014_run_status_smallint
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "015_sha256_bytea"
+down_revision: Union[str, None] = "014_run_status_smallint"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Halves the column and the ix_import_runs_file_sha256 keys (rebuilt by the type change)
+    op.execute("ALTER TABLE import_runs ALTER COLUMN file_sha256 TYPE BYTEA USING decode(file_sha256, 'hex')")
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE import_runs ALTER COLUMN file_sha256 TYPE VARCHAR(64) USING encode(file_sha256, 'hex')"
+    )
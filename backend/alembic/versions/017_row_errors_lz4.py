@@ -0,0 +1,28 @@
+"""compress import_row_errors.raw_row with lz4 and TOAST it earlier
+
+Revision ID: 017_row_errors_lz4
+Revises: 015_sha256_bytea
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "017_row_errors_lz4"
+down_revision: Union[str, None] = "015_sha256_bytea"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Requires Postgres 14+ built with lz4. Applies to newly written values; existing rows
+    # keep pglz until rewritten. toast_tuple_target moves raw_row out of line sooner so the
+    # heap holds mostly the small metadata columns.
+    op.execute("ALTER TABLE import_row_errors ALTER COLUMN raw_row SET COMPRESSION lz4")
+    op.execute("ALTER TABLE import_row_errors SET (toast_tuple_target = 128)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE import_row_errors RESET (toast_tuple_target)")
+    op.execute("ALTER TABLE import_row_errors ALTER COLUMN raw_row SET COMPRESSION DEFAULT")
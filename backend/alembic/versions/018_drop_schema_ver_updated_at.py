@@ -0,0 +1,28 @@
+"""drop updated_at from dataset_schema_versions (versions are immutable)
+
+Revision ID: 018_drop_schema_ver_updated_at
+Revises: 017_row_errors_lz4
+Create Date: 2025-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "018_drop_schema_ver_updated_at"
+down_revision: Union[str, None] = "017_row_errors_lz4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_column("dataset_schema_versions", "updated_at")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "dataset_schema_versions",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute("UPDATE dataset_schema_versions SET updated_at = created_at")
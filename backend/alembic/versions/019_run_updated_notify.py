@@ -0,0 +1,41 @@
+"""notify listeners when an import run changes (LISTEN/NOTIFY for admin SSE)
+
+Revision ID: 019_run_updated_notify
+Revises: 018_drop_schema_ver_updated_at
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "019_run_updated_notify"
+down_revision: Union[str, None] = "018_drop_schema_ver_updated_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One channel per org ("run_updated:<org_id>"); the payload is just the run id, which
+    # stays well under the 8000-byte NOTIFY limit regardless of last_error size.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_import_run_updated() RETURNS trigger AS $$
+        DECLARE
+            run_org_id uuid;
+        BEGIN
+            SELECT org_id INTO run_org_id FROM import_datasets WHERE id = NEW.dataset_id;
+            PERFORM pg_notify('run_updated:' || run_org_id::text, NEW.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER import_runs_notify_updated
+        AFTER INSERT OR UPDATE ON import_runs
+        FOR EACH ROW EXECUTE FUNCTION notify_import_run_updated()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS import_runs_notify_updated ON import_runs")
+    op.execute("DROP FUNCTION IF EXISTS notify_import_run_updated()")
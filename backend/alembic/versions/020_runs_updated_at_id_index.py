@@ -0,0 +1,33 @@
+"""add (updated_at DESC, id DESC) index on import_runs for keyset pagination
+
+Revision ID: 020_runs_updated_at_id_index
+Revises: 019_run_updated_notify
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "020_runs_updated_at_id_index"
+down_revision: Union[str, None] = "019_run_updated_notify"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Admin runs list pages with WHERE (updated_at, id) < (:u, :i) ORDER BY updated_at DESC, id DESC;
+    # matching the sort order lets each page be an index seek instead of an OFFSET scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_updated_at_id",
+            "import_runs",
+            [sa.text("updated_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_runs_updated_at_id", table_name="import_runs")
@@ -0,0 +1,62 @@
+"""add covering indexes for the admin runs list and analytics aggregations
+
+Revision ID: 021_covering_runs_records_idx
+Revises: 020_runs_updated_at_id_index
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "021_covering_runs_records_idx"
+down_revision: Union[str, None] = "020_runs_updated_at_id_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match 012_partition_import_records
+RECORD_PARTITIONS = 16
+
+
+def upgrade() -> None:
+    # Admin list / SSE delta: runs of the org's datasets, newest update first, answered
+    # from the index. last_error is left out: unbounded text can exceed the btree tuple limit.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_dataset_id_updated_at",
+            "import_runs",
+            ["dataset_id", sa.text("updated_at DESC")],
+            unique=False,
+            postgresql_include=[
+                "status",
+                "progress_percent",
+                "processed_rows",
+                "total_rows",
+                "attempt_count",
+                "dlq",
+            ],
+            postgresql_concurrently=True,
+        )
+
+    # Analytics: per-run date range scans that read only the aggregated columns.
+    # A partitioned parent cannot be indexed concurrently, so create the parent index
+    # ON ONLY (invalid until complete), build each partition's index concurrently and
+    # attach it; the parent becomes valid once every partition is attached.
+    op.execute(
+        "CREATE INDEX ix_import_records_run_id_date ON ONLY import_records (run_id, date) "
+        "INCLUDE (channel, campaign, spend, clicks, conversions)"
+    )
+    for i in range(RECORD_PARTITIONS):
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY import_records_p{i}_run_id_date_idx "
+                f"ON import_records_p{i} (run_id, date) "
+                "INCLUDE (channel, campaign, spend, clicks, conversions)"
+            )
+        op.execute(f"ALTER INDEX ix_import_records_run_id_date ATTACH PARTITION import_records_p{i}_run_id_date_idx")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_records_run_id_date", table_name="import_records")
+    op.drop_index("ix_import_runs_dataset_id_updated_at", table_name="import_runs")
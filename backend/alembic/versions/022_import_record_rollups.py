@@ -0,0 +1,127 @@
+"""add import_record_rollups, kept in sync with import_records by triggers
+
+Revision ID: 022_import_record_rollups
+Revises: 021_covering_runs_records_idx
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "022_import_record_rollups"
+down_revision: Union[str, None] = "021_covering_runs_records_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pre-summed spend/clicks/conversions per (run, date, channel, campaign). Keyed by run
+    # rather than dataset so analytics can keep filtering on the run's status.
+    op.create_table(
+        "import_record_rollups",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("channel", sa.String(length=255), nullable=False),
+        sa.Column("campaign", sa.String(length=512), nullable=False),
+        sa.Column("spend", sa.Numeric(precision=20, scale=2), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False),
+        sa.Column("conversions", sa.BigInteger(), nullable=False),
+        sa.Column("record_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["import_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id", "date", "channel", "campaign"),
+    )
+
+    # Statement-level triggers with transition tables: one grouped upsert per INSERT /
+    # UPDATE / DELETE statement on import_records, however many rows it touched
+    op.execute("""
+        CREATE OR REPLACE FUNCTION import_records_rollup_add() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO import_record_rollups AS r
+                (run_id, date, channel, campaign, spend, clicks, conversions, record_count)
+            SELECT run_id, date, channel, campaign,
+                   SUM(spend), SUM(clicks), SUM(conversions), COUNT(*)
+            FROM new_rows
+            GROUP BY run_id, date, channel, campaign
+            ON CONFLICT (run_id, date, channel, campaign) DO UPDATE SET
+                spend = r.spend + EXCLUDED.spend,
+                clicks = r.clicks + EXCLUDED.clicks,
+                conversions = r.conversions + EXCLUDED.conversions,
+                record_count = r.record_count + EXCLUDED.record_count;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION import_records_rollup_subtract() RETURNS trigger AS $$
+        BEGIN
+            UPDATE import_record_rollups AS r SET
+                spend = r.spend - o.spend,
+                clicks = r.clicks - o.clicks,
+                conversions = r.conversions - o.conversions,
+                record_count = r.record_count - o.record_count
+            FROM (
+                SELECT run_id, date, channel, campaign,
+                       SUM(spend) AS spend, SUM(clicks) AS clicks,
+                       SUM(conversions) AS conversions, COUNT(*) AS record_count
+                FROM old_rows
+                GROUP BY run_id, date, channel, campaign
+            ) AS o
+            WHERE r.run_id = o.run_id
+              AND r.date = o.date
+              AND r.channel = o.channel
+              AND r.campaign = o.campaign;
+            DELETE FROM import_record_rollups AS r
+            WHERE r.record_count <= 0
+              AND r.run_id IN (SELECT DISTINCT run_id FROM old_rows);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER import_records_rollup_insert
+        AFTER INSERT ON import_records
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION import_records_rollup_add()
+    """)
+    op.execute("""
+        CREATE TRIGGER import_records_rollup_delete
+        AFTER DELETE ON import_records
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION import_records_rollup_subtract()
+    """)
+    # An UPDATE is the old rows taken out and the new rows put back
+    op.execute("""
+        CREATE TRIGGER import_records_rollup_update_old
+        AFTER UPDATE ON import_records
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION import_records_rollup_subtract()
+    """)
+    op.execute("""
+        CREATE TRIGGER import_records_rollup_update_new
+        AFTER UPDATE ON import_records
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION import_records_rollup_add()
+    """)
+
+    # Backfill from the records already loaded
+    op.execute("""
+        INSERT INTO import_record_rollups
+            (run_id, date, channel, campaign, spend, clicks, conversions, record_count)
+        SELECT run_id, date, channel, campaign,
+               SUM(spend), SUM(clicks), SUM(conversions), COUNT(*)
+        FROM import_records
+        GROUP BY run_id, date, channel, campaign
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS import_records_rollup_update_new ON import_records")
+    op.execute("DROP TRIGGER IF EXISTS import_records_rollup_update_old ON import_records")
+    op.execute("DROP TRIGGER IF EXISTS import_records_rollup_delete ON import_records")
+    op.execute("DROP TRIGGER IF EXISTS import_records_rollup_insert ON import_records")
+    op.execute("DROP FUNCTION IF EXISTS import_records_rollup_subtract()")
+    op.execute("DROP FUNCTION IF EXISTS import_records_rollup_add()")
+    op.drop_table("import_record_rollups")
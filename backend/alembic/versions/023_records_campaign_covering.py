@@ -0,0 +1,46 @@
+"""make ix_import_records_run_id_campaign cover spend, clicks and conversions
+
+Revision ID: 023_records_campaign_covering
+Revises: 022_import_record_rollups
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "023_records_campaign_covering"
+down_revision: Union[str, None] = "022_import_record_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match 012_partition_import_records
+RECORD_PARTITIONS = 16
+
+
+def upgrade() -> None:
+    # Compare aggregates filter on run_id and sum spend/clicks/conversions, grouped by
+    # campaign: with those columns in the index they become index-only scans.
+    # Same ON ONLY + per-partition CONCURRENTLY + ATTACH build as 021.
+    op.execute("ALTER INDEX ix_import_records_run_id_campaign RENAME TO ix_import_records_run_id_campaign_old")
+    op.execute(
+        "CREATE INDEX ix_import_records_run_id_campaign ON ONLY import_records (run_id, campaign) "
+        "INCLUDE (spend, clicks, conversions)"
+    )
+    for i in range(RECORD_PARTITIONS):
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY import_records_p{i}_run_id_campaign_incl_idx "
+                f"ON import_records_p{i} (run_id, campaign) "
+                "INCLUDE (spend, clicks, conversions)"
+            )
+        op.execute(
+            f"ALTER INDEX ix_import_records_run_id_campaign ATTACH PARTITION import_records_p{i}_run_id_campaign_incl_idx"
+        )
+    # Partitioned indexes cannot be dropped CONCURRENTLY; the drop itself is brief
+    op.drop_index("ix_import_records_run_id_campaign_old", table_name="import_records")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_records_run_id_campaign", table_name="import_records")
+    op.create_index("ix_import_records_run_id_campaign", "import_records", ["run_id", "campaign"], unique=False)
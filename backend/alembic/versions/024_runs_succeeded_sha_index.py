@@ -0,0 +1,35 @@
+"""add partial (dataset_id, file_sha256) index on SUCCEEDED import_runs for upload dedup
+
+Revision ID: 024_runs_succeeded_sha_index
+Revises: 023_records_campaign_covering
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "024_runs_succeeded_sha_index"
+down_revision: Union[str, None] = "023_records_campaign_covering"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uploads are rejected when a SUCCEEDED run of the dataset has the same checksum.
+    # Not unique: reprocessing copies file_sha256 onto new runs, which may also succeed.
+    # status 3 is ImportRunStatusCode.SUCCEEDED.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_import_runs_dataset_id_sha256_succeeded",
+            "import_runs",
+            ["dataset_id", "file_sha256"],
+            unique=False,
+            postgresql_where=sa.text("status = 3"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_runs_dataset_id_sha256_succeeded", table_name="import_runs")
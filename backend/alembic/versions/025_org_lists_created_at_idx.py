@@ -0,0 +1,49 @@
+"""add (org_id, created_at DESC) indexes for org member and invite lists
+
+Revision ID: 025_org_lists_created_at_idx
+Revises: 024_runs_succeeded_sha_index
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "025_org_lists_created_at_idx"
+down_revision: Union[str, None] = "024_runs_succeeded_sha_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Member and invite lists filter by org and sort newest first; with created_at in the
+    # key they are read in order from the index instead of being sorted.
+    # (user_id) for list_orgs already exists as ix_organization_members_user.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organization_members_org_created_at",
+            "organization_members",
+            ["org_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_organization_invites_org_created_at",
+            "organization_invites",
+            ["org_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # Superseded by the composite index above (same leading column)
+        op.drop_index(
+            "ix_organization_invites_org",
+            table_name="organization_invites",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.create_index("ix_organization_invites_org", "organization_invites", ["org_id"], unique=False)
+    op.drop_index("ix_organization_invites_org_created_at", table_name="organization_invites")
+    op.drop_index("ix_organization_members_org_created_at", table_name="organization_members")
@@ -0,0 +1,30 @@
+"""drop ix_import_run_attempts_run_id (covered by the (run_id, attempt_number) index)
+
+Revision ID: 026_runs_lookup_indexes
+Revises: 025_org_lists_created_at_idx
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "026_runs_lookup_indexes"
+down_revision: Union[str, None] = "025_org_lists_created_at_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (run_id, attempt_number) already serves run_id lookups and the DESC listing
+    # (scanned backward), so the single-column index only adds write cost
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_import_run_attempts_run_id",
+            table_name="import_run_attempts",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.create_index("ix_import_run_attempts_run_id", "import_run_attempts", ["run_id"], unique=False)
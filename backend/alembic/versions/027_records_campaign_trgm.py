@@ -0,0 +1,44 @@
+"""pg_trgm GIN index on import_records.campaign for substring search
+
+Revision ID: 027_records_campaign_trgm
+Revises: 026_runs_lookup_indexes
+Create Date: 2025-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "027_records_campaign_trgm"
+down_revision: Union[str, None] = "026_runs_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match 012_partition_import_records
+RECORD_PARTITIONS = 16
+
+
+def upgrade() -> None:
+    # The records search is campaign ILIKE '%term%': the leading wildcard rules out the
+    # B-tree, so without trigrams every record of the run is scanned. The partition is
+    # pruned by run_id and the planner ANDs this index with the run_id one (bitmap).
+    # Same ON ONLY + per-partition CONCURRENTLY + ATTACH build as 021.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_import_records_campaign_trgm ON ONLY import_records "
+        "USING gin (campaign gin_trgm_ops)"
+    )
+    for i in range(RECORD_PARTITIONS):
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY import_records_p{i}_campaign_trgm_idx "
+                f"ON import_records_p{i} USING gin (campaign gin_trgm_ops)"
+            )
+        op.execute(
+            f"ALTER INDEX ix_import_records_campaign_trgm ATTACH PARTITION import_records_p{i}_campaign_trgm_idx"
+        )
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed: other objects may have come to depend on it
+    op.drop_index("ix_import_records_campaign_trgm", table_name="import_records")
@@ -3,23 +3,27 @@ Admin-only API: list runs across datasets, SSE for run list updates.
 Org-scoped: shows runs for active org only. Requires ADMIN or OWNER role.
 """
 import asyncio
+import base64
 import logging
 import os
 import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import Row, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.core.auth import get_current_user
-from app.core.org_context import require_active_org, require_org_admin_or_owner
+from app.core.org_context import require_active_org
+from app.core.permissions import require_org_admin_or_owner
 from app.core.sse import sse_event
-from app.db import get_session, async_session_factory
+from app.db import engine, get_session, async_session_factory
 from app.models.imports import ImportRun, ImportDataset
 from app.models.user import User
 
@@ -49,9 +53,10 @@ ADMIN_RUNS_SSE_HEADERS = {
     "X-Accel-Buffering": "no",
 }
 
-ADMIN_POLL_INTERVAL = 2.0
 ADMIN_HEARTBEAT_INTERVAL = 20.0
 ADMIN_CHANGED_CAP = 50
+# NOTIFY channel fired by the import_runs trigger (see alembic 019_run_updated_notify)
+RUN_UPDATED_CHANNEL = "run_updated:{org_id}"
 
 
 class AdminRunItem(BaseModel):
@@ -75,22 +80,63 @@ class AdminRunsListResponse(BaseModel):
     items: list[AdminRunItem]
     page: int
     page_size: int
-    total: int
+    # Not computed when paging by cursor (it would need the full scan the cursor avoids)
+    total: int | None
+    next_cursor: str | None = None
 
 
-def _run_to_item(run: ImportRun, dataset_name: str) -> dict:
+def err(code: str, message: str, status_code: int = 400) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail={"error": {"code": code, "message": message}},
+    )
+
+
+def _encode_cursor(updated_at: datetime, run_id: UUID) -> str:
+    raw = f"{updated_at.isoformat()}|{run_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        updated_at, run_id = raw.split("|", 1)
+        return datetime.fromisoformat(updated_at), UUID(run_id)
+    except ValueError as e:
+        raise err("invalid_cursor", "cursor is malformed") from e
+
+
+# Plain columns rather than ImportRun entities: these paths are read-only, so rows
+# skip the identity map and attribute instrumentation
+ADMIN_RUN_COLUMNS = (
+    ImportRun.id,
+    ImportRun.dataset_id,
+    ImportDataset.name.label("dataset_name"),
+    ImportRun.status,
+    ImportRun.progress_percent,
+    ImportRun.processed_rows,
+    ImportRun.total_rows,
+    ImportRun.attempt_count,
+    ImportRun.dlq,
+    ImportRun.updated_at,
+    ImportRun.last_error,
+)
+
+
+def _row_to_item(row) -> dict:
+    """Build an admin run item from a row selected with ADMIN_RUN_COLUMNS."""
     return {
-        "id": str(run.id),
-        "dataset_id": str(run.dataset_id),
-        "dataset_name": dataset_name,
-        "status": run.status.value,
-        "progress_percent": run.progress_percent,
-        "processed_rows": run.processed_rows,
-        "total_rows": run.total_rows,
-        "attempt_count": run.attempt_count,
-        "dlq": run.dlq,
-        "updated_at": run.updated_at.isoformat(),
-        "last_error": run.last_error,
+        "id": str(row.id),
+        "dataset_id": str(row.dataset_id),
+        "dataset_name": row.dataset_name,
+        "status": row.status.value,
+        "progress_percent": row.progress_percent,
+        "processed_rows": row.processed_rows,
+        "total_rows": row.total_rows,
+        "attempt_count": row.attempt_count,
+        "dlq": row.dlq,
+        "updated_at": row.updated_at.isoformat(),
+        "last_error": row.last_error,
     }
 
 
@@ -104,20 +150,25 @@ async def list_admin_runs(
     q: str | None = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
+    cursor: str | None = Query(None),
 ):
     """
     List recent runs across datasets in active org.
     Requires ADMIN or OWNER role in active org.
-    Supports filters.
+    Supports filters. Pass next_cursor back as cursor for keyset paging; page is
+    still honoured (via OFFSET) when no cursor is given.
     """
     org_id, _ = await require_active_org(current_user, session)
     await require_org_admin_or_owner(org_id, current_user, session)
     
+    columns = list(ADMIN_RUN_COLUMNS)
+    if cursor is None:
+        # Total rides along on every row via a window count, so filters are evaluated once
+        columns.append(func.count().over().label("total"))
     base = (
-        select(ImportRun)
+        select(*columns)
         .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
         .where(ImportDataset.org_id == org_id)
-        .options(selectinload(ImportRun.dataset))
     )
     if status:
         base = base.where(ImportRun.status == status)
@@ -128,31 +179,31 @@ async def list_admin_runs(
     if q and q.strip():
         base = base.where(ImportDataset.name.ilike(f"%{q.strip()}%"))
 
-    base_count = (
-        select(ImportRun)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(ImportDataset.org_id == org_id)
-    )
-    if status:
-        base_count = base_count.where(ImportRun.status == status)
-    if dlq is not None:
-        base_count = base_count.where(ImportRun.dlq == dlq)
-    if dataset_id is not None:
-        base_count = base_count.where(ImportRun.dataset_id == dataset_id)
-    if q and q.strip():
-        base_count = base_count.where(ImportDataset.name.ilike(f"%{q.strip()}%"))
-    total = (await session.execute(select(func.count()).select_from(base_count.subquery()))).scalar() or 0
-
-    base = base.order_by(ImportRun.updated_at.desc())
-    base = base.offset((page - 1) * page_size).limit(page_size)
-    result = await session.execute(base)
-    runs = result.unique().scalars().all()
+    # id breaks ties so the (updated_at, id) keyset is a total order
+    base = base.order_by(ImportRun.updated_at.desc(), ImportRun.id.desc())
+    if cursor is not None:
+        after_updated_at, after_id = _decode_cursor(cursor)
+        base = base.where(tuple_(ImportRun.updated_at, ImportRun.id) < tuple_(after_updated_at, after_id))
+    else:
+        base = base.offset((page - 1) * page_size)
+    result = await session.execute(base.limit(page_size))
+    rows = result.all()
+    if cursor is None:
+        total = rows[0].total if rows else 0
+    else:
+        total = None
 
-    items = [
-        AdminRunItem(**_run_to_item(run, run.dataset.name))
-        for run in runs
-    ]
-    return AdminRunsListResponse(items=items, page=page, page_size=page_size, total=total)
+    items = [AdminRunItem(**_row_to_item(row)) for row in rows]
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = _encode_cursor(rows[-1].updated_at, rows[-1].id)
+    return AdminRunsListResponse(
+        items=items,
+        page=page,
+        page_size=page_size,
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 async def _fetch_runs_updated_after(
@@ -160,21 +211,19 @@ async def _fetch_runs_updated_after(
     org_id: UUID,
     updated_after: datetime | None,
     limit: int = ADMIN_CHANGED_CAP,
-) -> list[tuple[ImportRun, str]]:
-    """Return list of (run, dataset_name) updated after given time, newest first, scoped to org."""
+) -> list[Row]:
+    """Return ADMIN_RUN_COLUMNS rows updated after given time, newest first, scoped to org."""
     base = (
-        select(ImportRun)
+        select(*ADMIN_RUN_COLUMNS)
         .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
         .where(ImportDataset.org_id == org_id)
-        .options(selectinload(ImportRun.dataset))
         .order_by(ImportRun.updated_at.desc())
         .limit(limit)
     )
     if updated_after is not None:
         base = base.where(ImportRun.updated_at > updated_after)
     result = await session.execute(base)
-    runs = result.unique().scalars().all()
-    return [(r, r.dataset.name) for r in runs]
+    return list(result.all())
 
 
 def _admin_sse_tracer():
@@ -185,59 +234,156 @@ def _admin_sse_tracer():
         return None
 
 
+@asynccontextmanager
+async def _listen_run_updates(org_id: UUID) -> AsyncIterator[asyncio.Event]:
+    """LISTEN on the org's run_updated channel; yields an Event set whenever a run changes."""
+    channel = RUN_UPDATED_CHANNEL.format(org_id=org_id)
+    wake = asyncio.Event()
+
+    def _on_notify(_conn, _pid, _channel, _payload) -> None:
+        wake.set()
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        listener_conn = raw.driver_connection
+        await listener_conn.add_listener(channel, _on_notify)
+        try:
+            yield wake
+        finally:
+            await listener_conn.remove_listener(channel, _on_notify)
+
+
+class _OrgRunsBroker:
+    """
+    One LISTEN (or polling fallback) loop per org in this process. Every admin SSE stream
+    for the org subscribes a queue; each change is fetched and encoded once, then fanned
+    out to all subscribers. A None on a queue means the broker has stopped.
+    """
+
+    def __init__(self, org_id: UUID) -> None:
+        self.org_id = org_id
+        self.subscribers: set[asyncio.Queue[bytes | None]] = set()
+        # Set once the listener is up and the watermark seeded, so a snapshot taken
+        # afterwards cannot miss a change
+        self.ready = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+
+    def _publish(self, message: bytes | None) -> None:
+        for queue in self.subscribers:
+            queue.put_nowait(message)
+
+    async def _run(self) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                wake: asyncio.Event | None = None
+                try:
+                    wake = await stack.enter_async_context(_listen_run_updates(self.org_id))
+                except Exception as e:
+                    logger.warning("Admin runs SSE: LISTEN unavailable, polling instead: %s", e)
+
+                async with async_session_factory() as session:
+                    latest = await _fetch_runs_updated_after(session, self.org_id, None, limit=1)
+                last_seen = latest[0].updated_at if latest else None
+                self.ready.set()
+
+                # Polling fallback backs off while nothing changes and resets on any change
+                poll_interval = settings.ADMIN_SSE_POLL_MIN_SECONDS
+                while True:
+                    if wake is None:
+                        await asyncio.sleep(poll_interval)
+                    else:
+                        await wake.wait()
+                        wake.clear()
+                    async with async_session_factory() as session:
+                        changed = await _fetch_runs_updated_after(
+                            session, self.org_id, last_seen, limit=ADMIN_CHANGED_CAP
+                        )
+                    if changed:
+                        last_seen = changed[0].updated_at
+                        items = [_row_to_item(row) for row in changed]
+                        self._publish(sse_event("runs.changed", {"items": items}))
+                        poll_interval = settings.ADMIN_SSE_POLL_MIN_SECONDS
+                    else:
+                        poll_interval = min(
+                            settings.ADMIN_SSE_POLL_MAX_SECONDS,
+                            poll_interval * settings.ADMIN_SSE_POLL_BACKOFF_FACTOR,
+                        )
+        except Exception as e:
+            logger.exception("Admin runs SSE poll: %s", e)
+            self._publish(sse_event("runs.error", {"message": str(e)}))
+            self._publish(None)
+        finally:
+            self.ready.set()
+            if _org_brokers.get(self.org_id) is self:
+                del _org_brokers[self.org_id]
+
+
+_org_brokers: dict[UUID, _OrgRunsBroker] = {}
+
+
+@asynccontextmanager
+async def _subscribe_run_updates(org_id: UUID) -> AsyncIterator[asyncio.Queue[bytes | None]]:
+    """Subscribe to the org's broker (starting it if needed); stops it with the last subscriber."""
+    broker = _org_brokers.get(org_id)
+    if broker is None:
+        broker = _OrgRunsBroker(org_id)
+        _org_brokers[org_id] = broker
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+    broker.subscribers.add(queue)
+    try:
+        await broker.ready.wait()
+        yield queue
+    finally:
+        broker.subscribers.discard(queue)
+        if not broker.subscribers:
+            broker.task.cancel()
+            if _org_brokers.get(org_id) is broker:
+                del _org_brokers[org_id]
+
+
 async def stream_admin_runs_events(org_id: UUID):
-    """SSE stream: initial runs.snapshot (first 50), then poll for runs.changed, heartbeat. Org-scoped."""
-    last_seen: datetime | None = None
-    last_heartbeat: float = 0.0
+    """
+    SSE stream: initial runs.snapshot (first 50), then runs.changed from the org's shared
+    broker (LISTEN/NOTIFY, or polling if unavailable), heartbeat. Org-scoped.
+    """
     tracer = _admin_sse_tracer()
     span = tracer.start_span("sse.admin.runs.events") if tracer else None
     if span:
         span.set_attribute("org.id_hash", _hash_id(str(org_id)))
     try:
-        async with async_session_factory() as session:
-            runs_data = await _fetch_runs_updated_after(session, org_id, None, limit=50)
-        items = [_run_to_item(run, name) for run, name in runs_data]
-        if span:
-            span.add_event("snapshot")
-        yield sse_event("runs.snapshot", {"items": items})
-        if runs_data:
-            last_seen = runs_data[0][0].updated_at
-        last_heartbeat = time.monotonic()
-    except asyncio.CancelledError:
-        if span:
-            span.end()
-        return
-    except Exception as e:
-        logger.exception("Admin runs SSE initial snapshot: %s", e)
-        if span:
-            span.end()
-        yield sse_event("runs.error", {"message": str(e)})
-        return
-
-    try:
-        while True:
-            await asyncio.sleep(ADMIN_POLL_INTERVAL)
+        # Subscribe before the snapshot so no change between the two is missed
+        async with _subscribe_run_updates(org_id) as updates:
             try:
                 async with async_session_factory() as session:
-                    changed = await _fetch_runs_updated_after(session, org_id, last_seen, limit=ADMIN_CHANGED_CAP)
-                if changed:
-                    items = [_run_to_item(run, name) for run, name in changed]
-                    if span:
-                        span.add_event("changed")
-                    yield sse_event("runs.changed", {"items": items})
-                    last_seen = changed[0][0].updated_at
-                now_sec = time.monotonic()
-                if now_sec - last_heartbeat >= ADMIN_HEARTBEAT_INTERVAL:
+                    runs_data = await _fetch_runs_updated_after(session, org_id, None, limit=50)
+                items = [_row_to_item(row) for row in runs_data]
+                if span:
+                    span.add_event("snapshot")
+                yield sse_event("runs.snapshot", {"items": items})
+            except Exception as e:
+                logger.exception("Admin runs SSE initial snapshot: %s", e)
+                yield sse_event("runs.error", {"message": str(e)})
+                return
+
+            last_heartbeat = time.monotonic()
+            while True:
+                # Idle until the broker publishes; wake up in time for the next heartbeat
+                timeout = max(0.0, ADMIN_HEARTBEAT_INTERVAL - (time.monotonic() - last_heartbeat))
+                try:
+                    message = await asyncio.wait_for(updates.get(), timeout=timeout)
+                except TimeoutError:
                     if span:
                         span.add_event("heartbeat")
                     yield sse_event("runs.heartbeat", {"time": datetime.now(timezone.utc).isoformat()})
-                    last_heartbeat = now_sec
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.exception("Admin runs SSE poll: %s", e)
-                yield sse_event("runs.error", {"message": str(e)})
-                break
+                    last_heartbeat = time.monotonic()
+                    continue
+                if message is None:
+                    break
+                if span:
+                    span.add_event("changed")
+                yield message
+    except asyncio.CancelledError:
+        pass
     finally:
         if span:
             span.end()
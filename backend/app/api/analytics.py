@@ -3,12 +3,12 @@ Analytics endpoints: summary and anomalies for imported marketing data.
 Owner-only: dataset must belong to current user.
 """
 from datetime import date, timedelta
-from decimal import Decimal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import BigInteger, Float, bindparam, cast, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
@@ -17,6 +17,7 @@ from app.db import get_session
 from app.models.imports import (
     ImportDataset,
     ImportRecord,
+    ImportRecordRollup,
     ImportRun,
     ImportRunStatus,
 )
@@ -26,6 +27,13 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 RANGE_DAYS = {"7d": 7, "30d": 30, "90d": 90}
 ANOMALIES_CAP = 50
+TOP_CAMPAIGNS_LIMIT = 10
+
+# grouping(channel, date, campaign) values for each grouping set of the summary query
+GROUPING_TOTALS = 0b111
+GROUPING_BY_CHANNEL = 0b011
+GROUPING_BY_DAY = 0b101
+GROUPING_BY_CAMPAIGN = 0b110
 
 
 def err(code: str, message: str, status_code: int = 400) -> HTTPException:
@@ -61,6 +69,122 @@ def _records_base(dataset_id: UUID):
     )
 
 
+def _scoped_rollups(*columns):
+    """
+    Select of ImportRecordRollup columns from SUCCEEDED runs in an org since a date.
+    Bound parameters: org_id, start_date, dataset_id (None = all datasets in the org).
+    The rollup holds per (run, date, channel, campaign) sums, so every aggregate here
+    (sums only) matches what scanning ImportRecord would give.
+    """
+    dataset_id = bindparam("dataset_id", type_=PG_UUID(as_uuid=True))
+    return (
+        select(*columns)
+        .select_from(ImportRecordRollup)
+        .join(ImportRun, ImportRecordRollup.run_id == ImportRun.id)
+        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
+        .where(
+            ImportDataset.org_id == bindparam("org_id"),
+            ImportRun.status == ImportRunStatus.SUCCEEDED,
+            ImportRecordRollup.date >= bindparam("start_date"),
+            # One statement shape whether or not a dataset filter is given
+            or_(dataset_id.is_(None), ImportRun.dataset_id == dataset_id),
+        )
+    )
+
+
+def _build_summary_stmt():
+    filtered = _scoped_rollups(
+        ImportRecordRollup.date,
+        ImportRecordRollup.channel,
+        ImportRecordRollup.campaign,
+        ImportRecordRollup.spend,
+        ImportRecordRollup.clicks,
+        ImportRecordRollup.conversions,
+    ).cte("filtered")
+
+    # Totals, by channel, by day and by campaign in one scan via GROUPING SETS.
+    # grouping() yields a bitmask of the columns rolled up in each row
+    # (channel=4, date=2, campaign=1), which tells the result sets apart.
+    grouping_id = func.grouping(filtered.c.channel, filtered.c.date, filtered.c.campaign)
+    spend_sum = func.sum(filtered.c.spend)
+    grouped = (
+        select(
+            filtered.c.channel,
+            filtered.c.date,
+            filtered.c.campaign,
+            # Cast in SQL so rows decode straight to float/int rather than Decimal
+            cast(func.coalesce(spend_sum, 0), Float).label("spend"),
+            cast(func.coalesce(func.sum(filtered.c.clicks), 0), BigInteger).label("clicks"),
+            cast(func.coalesce(func.sum(filtered.c.conversions), 0), BigInteger).label("conversions"),
+            grouping_id.label("grouping_id"),
+            func.row_number()
+            .over(partition_by=grouping_id, order_by=spend_sum.desc())
+            .label("spend_rank"),
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(),
+                tuple_(filtered.c.channel),
+                tuple_(filtered.c.date),
+                tuple_(filtered.c.campaign),
+            )
+        )
+        .subquery()
+    )
+    return (
+        select(grouped)
+        .where(
+            or_(
+                grouped.c.grouping_id != GROUPING_BY_CAMPAIGN,
+                grouped.c.spend_rank <= TOP_CAMPAIGNS_LIMIT,
+            )
+        )
+        .order_by(grouped.c.date, grouped.c.spend_rank)
+    )
+
+
+def _build_anomalies_stmt():
+    # Daily spend by (channel, date)
+    daily = (
+        _scoped_rollups(
+            ImportRecordRollup.channel,
+            ImportRecordRollup.date,
+            func.sum(ImportRecordRollup.spend).label("spend"),
+        )
+        .group_by(ImportRecordRollup.channel, ImportRecordRollup.date)
+        .cte("daily")
+    )
+
+    # Per-channel mean and population std as window functions; only anomalous
+    # (date, channel) rows, spend > mean + 3*std, come back from the database
+    stats = select(
+        daily.c.channel,
+        daily.c.date,
+        daily.c.spend,
+        func.avg(daily.c.spend).over(partition_by=daily.c.channel).label("mean"),
+        func.stddev_pop(daily.c.spend).over(partition_by=daily.c.channel).label("std"),
+    ).subquery()
+    z_score = (stats.c.spend - stats.c.mean) / stats.c.std
+    return (
+        select(
+            stats.c.channel,
+            stats.c.date,
+            cast(stats.c.spend, Float).label("spend"),
+            cast(stats.c.mean, Float).label("mean"),
+            cast(stats.c.std, Float).label("std"),
+            cast(z_score, Float).label("z_score"),
+        )
+        .where(stats.c.std > 0, stats.c.spend > stats.c.mean + 3 * stats.c.std)
+        .order_by(z_score.desc())
+        .limit(ANOMALIES_CAP)
+    )
+
+
+# Built once at import; requests only bind parameters
+SUMMARY_STMT = _build_summary_stmt()
+ANOMALIES_STMT = _build_anomalies_stmt()
+
+
 class TotalsSchema(BaseModel):
     spend: float
     clicks: int
@@ -99,14 +223,6 @@ class SummaryResponse(BaseModel):
         populate_by_name = True
 
 
-def _decimal_to_float(v) -> float:
-    if v is None:
-        return 0.0
-    if isinstance(v, Decimal):
-        return float(v)
-    return float(v)
-
-
 @router.get("/summary", response_model=SummaryResponse)
 async def get_analytics_summary(
     session: AsyncSession = Depends(get_session),
@@ -126,140 +242,51 @@ async def get_analytics_summary(
         raise err("invalid_range", "range must be 7d, 30d, or 90d")
     start_date = date.today() - timedelta(days=days)
 
-    # Build base query with org filter
-    base_join = (
-        select(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    
-    # If dataset_id specified, add filter and verify ownership
     if dataset_id:
         await _ensure_dataset_in_active_org(session, dataset_id, org_id)
-        base_join = base_join.where(ImportRun.dataset_id == dataset_id)
 
-    # Totals
-    totals_q = (
-        select(
-            func.coalesce(func.sum(ImportRecord.spend), 0).label("spend"),
-            func.coalesce(func.sum(ImportRecord.clicks), 0).label("clicks"),
-            func.coalesce(func.sum(ImportRecord.conversions), 0).label("conversions"),
+    rows = (
+        await session.execute(
+            SUMMARY_STMT,
+            {"org_id": org_id, "start_date": start_date, "dataset_id": dataset_id},
         )
-        .select_from(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    if dataset_id:
-        totals_q = totals_q.where(ImportRun.dataset_id == dataset_id)
-    totals_row = (await session.execute(totals_q)).one()
-    totals = TotalsSchema(
-        spend=_decimal_to_float(totals_row.spend),
-        clicks=int(totals_row.clicks or 0),
-        conversions=int(totals_row.conversions or 0),
-    )
-
-    # By channel
-    channel_q = (
-        select(
-            ImportRecord.channel,
-            func.sum(ImportRecord.spend).label("spend"),
-            func.sum(ImportRecord.clicks).label("clicks"),
-            func.sum(ImportRecord.conversions).label("conversions"),
-        )
-        .select_from(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    if dataset_id:
-        channel_q = channel_q.where(ImportRun.dataset_id == dataset_id)
-    channel_q = channel_q.group_by(ImportRecord.channel)
-    channel_rows = (await session.execute(channel_q)).all()
-    by_channel = [
-        ByChannelRow(
-            channel=row.channel or "",
-            spend=_decimal_to_float(row.spend),
-            clicks=int(row.clicks or 0),
-            conversions=int(row.conversions or 0),
-        )
-        for row in channel_rows
-    ]
-
-    # By day
-    day_q = (
-        select(
-            ImportRecord.date,
-            func.sum(ImportRecord.spend).label("spend"),
-            func.sum(ImportRecord.clicks).label("clicks"),
-            func.sum(ImportRecord.conversions).label("conversions"),
-        )
-        .select_from(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    if dataset_id:
-        day_q = day_q.where(ImportRun.dataset_id == dataset_id)
-    day_q = day_q.group_by(ImportRecord.date).order_by(ImportRecord.date)
-    day_rows = (await session.execute(day_q)).all()
-    by_day = [
-        ByDayRow(
-            date=row.date.isoformat(),
-            spend=_decimal_to_float(row.spend),
-            clicks=int(row.clicks or 0),
-            conversions=int(row.conversions or 0),
-        )
-        for row in day_rows
-    ]
-
-    # Top campaigns
-    camp_q = (
-        select(
-            ImportRecord.campaign,
-            func.sum(ImportRecord.spend).label("spend"),
-            func.sum(ImportRecord.clicks).label("clicks"),
-            func.sum(ImportRecord.conversions).label("conversions"),
-        )
-        .select_from(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    if dataset_id:
-        camp_q = camp_q.where(ImportRun.dataset_id == dataset_id)
-    camp_q = camp_q.group_by(ImportRecord.campaign).order_by(func.sum(ImportRecord.spend).desc()).limit(10)
-    camp_rows = (await session.execute(camp_q)).all()
-    top_campaigns = [
-        TopCampaignRow(
-            campaign=row.campaign or "",
-            spend=_decimal_to_float(row.spend),
-            clicks=int(row.clicks or 0),
-            conversions=int(row.conversions or 0),
-        )
-        for row in camp_rows
-    ]
+    ).all()
+
+    totals = TotalsSchema(spend=0.0, clicks=0, conversions=0)
+    by_channel: list[ByChannelRow] = []
+    by_day: list[ByDayRow] = []
+    top_campaigns: list[TopCampaignRow] = []
+    for row in rows:
+        spend, clicks, conversions = row.spend, row.clicks, row.conversions
+        if row.grouping_id == GROUPING_TOTALS:
+            totals = TotalsSchema(spend=spend, clicks=clicks, conversions=conversions)
+        elif row.grouping_id == GROUPING_BY_CHANNEL:
+            by_channel.append(
+                ByChannelRow(
+                    channel=row.channel or "",
+                    spend=spend,
+                    clicks=clicks,
+                    conversions=conversions,
+                )
+            )
+        elif row.grouping_id == GROUPING_BY_DAY:
+            by_day.append(
+                ByDayRow(
+                    date=row.date.isoformat(),
+                    spend=spend,
+                    clicks=clicks,
+                    conversions=conversions,
+                )
+            )
+        elif row.grouping_id == GROUPING_BY_CAMPAIGN:
+            top_campaigns.append(
+                TopCampaignRow(
+                    campaign=row.campaign or "",
+                    spend=spend,
+                    clicks=clicks,
+                    conversions=conversions,
+                )
+            )
 
     return SummaryResponse(
         range=range_param,
@@ -306,64 +333,23 @@ async def get_analytics_anomalies(
         raise err("invalid_range", "range must be 7d, 30d, or 90d")
     start_date = date.today() - timedelta(days=days)
 
-    # Daily spend by (channel, date)
-    daily_q = (
-        select(
-            ImportRecord.channel,
-            ImportRecord.date,
-            func.sum(ImportRecord.spend).label("spend"),
+    rows = (
+        await session.execute(
+            ANOMALIES_STMT,
+            {"org_id": org_id, "start_date": start_date, "dataset_id": dataset_id},
         )
-        .select_from(ImportRecord)
-        .join(ImportRun, ImportRecord.run_id == ImportRun.id)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportDataset.org_id == org_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
-            ImportRecord.date >= start_date,
-        )
-    )
-    if dataset_id:
-        daily_q = daily_q.where(ImportRun.dataset_id == dataset_id)
-    daily_q = daily_q.group_by(ImportRecord.channel, ImportRecord.date)
-    rows = (await session.execute(daily_q)).all()
-
-    # Group by channel: list of (date, spend)
-    from collections import defaultdict
-    by_channel: dict[str, list[tuple[date, float]]] = defaultdict(list)
-    for r in rows:
-        by_channel[r.channel or ""].append((r.date, _decimal_to_float(r.spend)))
-
-    # For each channel compute mean, std; flag (date, channel, spend) where spend > mean + 3*std
-    anomalies: list[tuple[date, str, float, float, float, float]] = []
-    for channel, points in by_channel.items():
-        if len(points) < 2:
-            continue
-        spends = [p[1] for p in points]
-        n = len(spends)
-        mean = sum(spends) / n
-        variance = sum((x - mean) ** 2 for x in spends) / n
-        std = (variance ** 0.5) if variance > 0 else 0.0
-        if std <= 0:
-            continue
-        threshold = mean + 3 * std
-        for d, spend in points:
-            if spend > threshold:
-                z = (spend - mean) / std
-                anomalies.append((d, channel, spend, mean, std, z))
-
-    anomalies.sort(key=lambda x: -x[5])
-    anomalies = anomalies[:ANOMALIES_CAP]
+    ).all()
 
     items = [
         AnomalyRow(
-            date=d.isoformat(),
-            channel=channel,
-            spend=spend,
-            channel_mean=round(mean, 2),
-            channel_std=round(std, 2),
-            z_score=round(z_score, 2),
+            date=row.date.isoformat(),
+            channel=row.channel or "",
+            spend=row.spend,
+            channel_mean=round(row.mean, 2),
+            channel_std=round(row.std, 2),
+            z_score=round(row.z_score, 2),
         )
-        for d, channel, spend, mean, std, z_score in anomalies
+        for row in rows
     ]
 
     return AnomaliesResponse(range=range_param, items=items)
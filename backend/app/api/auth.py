@@ -6,12 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user, require_admin
 from app.core.org_context import ensure_personal_org, get_user_org_role
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import create_access_token, hash_password_async, verify_password_async
 from app.db import get_session
 from app.models.user import User, UserRole
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# bcrypt hash of a random throwaway password. Unknown emails are verified against it so a
+# miss takes as long as a wrong password and does not reveal which emails exist.
+DUMMY_PASSWORD_HASH = "$2b$12$D2Z6tJc2rKZOHk1d9lSJkehHQ/O3.NDSA8yDioYCM7jZkPKfsB/6C"
+
 
 # --- Request/Response schemas ---
 
@@ -54,9 +58,16 @@ async def login(
     body: LoginRequest,
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(select(User).where(User.email == body.email))
-    user = result.scalar_one_or_none()
-    if not user or not verify_password(body.password, user.password_hash):
+    # Only the columns the response needs; no ORM entity is loaded for a login
+    result = await session.execute(
+        select(User.id, User.email, User.name, User.role, User.password_hash).where(
+            User.email == body.email
+        )
+    )
+    user = result.one_or_none()
+    password_hash = user.password_hash if user else DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(body.password, password_hash)
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -83,8 +94,9 @@ async def me(
     session: AsyncSession = Depends(get_session),
 ):
     # Ensure personal org exists
-    await ensure_personal_org(current_user, session)
-    await session.refresh(current_user)
+    # Only reload the user when it was actually changed
+    if await ensure_personal_org(current_user, session):
+        await session.refresh(current_user)
     
     # Get active org role
     active_org_role = None
@@ -125,7 +137,7 @@ async def create_user(
         email=body.email,
         name=body.name,
         role=body.role,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
     )
     session.add(user)
     await session.flush()
@@ -1,22 +1,23 @@
 """
 Compare runs endpoint: compare two runs within a dataset to show impact of schema/rules changes.
 """
+import asyncio
 from uuid import UUID
-from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import Float, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import get_current_user
 from app.core.org_context import require_active_org
-from app.db import get_session
-from app.models.user import User
+from app.db import async_session_factory, get_session
+from app.models.orgs import Organization
 from app.models.imports import ImportRun, ImportRunStatus, ImportDataset, ImportRecord
 
 
 router = APIRouter(prefix="/datasets", tags=["compare"])
 
+TOP_CHANGED_CAMPAIGNS = 10
+
 
 def err(code: str, message: str, status_code: int = 400) -> HTTPException:
     return HTTPException(
@@ -33,22 +34,22 @@ class RunCompareSummary(BaseModel):
     total_rows: int | None
     success_rows: int
     error_rows: int
-    spend_total: Decimal
-    clicks_total: Decimal
-    conversions_total: Decimal
+    spend_total: float
+    clicks_total: float
+    conversions_total: float
 
 
 class SpendDiff(BaseModel):
-    left: Decimal
-    right: Decimal
-    delta: Decimal
+    left: float
+    right: float
+    delta: float
 
 
 class CampaignDiff(BaseModel):
     campaign: str
-    spend_left: Decimal
-    spend_right: Decimal
-    delta: Decimal
+    spend_left: float
+    spend_right: float
+    delta: float
 
 
 class CompareDiff(BaseModel):
@@ -67,9 +68,59 @@ class CompareResponse(BaseModel):
     diff: CompareDiff
 
 
-def _decimal_to_float(d: Decimal | None) -> float:
-    """Convert Decimal to float for JSON serialization."""
-    return float(d) if d is not None else 0.0
+def _sum_for_run(column, run_id: UUID):
+    """SUM(column) FILTER (WHERE run_id = :run_id), 0 when the run has no rows."""
+    return func.coalesce(func.sum(column).filter(ImportRecord.run_id == run_id), 0)
+
+
+def _sum_columns(column, name: str, left_run_id: UUID, right_run_id: UUID) -> list:
+    """
+    left_/right_/delta_<name> as double precision. The delta is taken on the exact
+    sums before the cast, so it does not pick up float rounding.
+    """
+    left = _sum_for_run(column, left_run_id)
+    right = _sum_for_run(column, right_run_id)
+    return [
+        cast(left, Float).label(f"left_{name}"),
+        cast(right, Float).label(f"right_{name}"),
+        cast(right - left, Float).label(f"delta_{name}"),
+    ]
+
+
+async def _compare_totals(left_run_id: UUID, right_run_id: UUID):
+    """Spend/clicks/conversions totals for both runs in one scan, on a dedicated session."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(
+                *_sum_columns(ImportRecord.spend, "spend", left_run_id, right_run_id),
+                *_sum_columns(ImportRecord.clicks, "clicks", left_run_id, right_run_id),
+                *_sum_columns(ImportRecord.conversions, "conversions", left_run_id, right_run_id),
+            ).where(ImportRecord.run_id.in_([left_run_id, right_run_id]))
+        )
+        return result.one()
+
+
+async def _top_changed_campaigns(left_run_id: UUID, right_run_id: UUID):
+    """
+    Campaigns with the largest absolute spend change between the runs, ranked and
+    limited in SQL, on a dedicated session.
+    """
+    spend_left = _sum_for_run(ImportRecord.spend, left_run_id)
+    spend_right = _sum_for_run(ImportRecord.spend, right_run_id)
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(
+                ImportRecord.campaign,
+                cast(spend_left, Float).label("spend_left"),
+                cast(spend_right, Float).label("spend_right"),
+                cast(spend_right - spend_left, Float).label("delta"),
+            )
+            .where(ImportRecord.run_id.in_([left_run_id, right_run_id]))
+            .group_by(ImportRecord.campaign)
+            .order_by(func.abs(spend_right - spend_left).desc())
+            .limit(TOP_CHANGED_CAMPAIGNS)
+        )
+        return result.all()
 
 
 @router.get("/{dataset_id}/runs/compare", response_model=CompareResponse)
@@ -78,14 +129,14 @@ async def compare_runs(
     left_run_id: UUID = Query(..., alias="leftRunId"),
     right_run_id: UUID = Query(..., alias="rightRunId"),
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
     """
     Compare two runs within a dataset.
     Both runs must be SUCCEEDED and belong to the dataset.
     Requires membership in dataset's org.
     """
-    org_id, _ = await require_active_org(current_user, session)
+    org_id, _ = active_org
     
     # Verify dataset belongs to active org
     dataset_result = await session.execute(
@@ -121,71 +172,23 @@ async def compare_runs(
     if right_run.status != ImportRunStatus.SUCCEEDED:
         raise err("invalid_status", f"Right run must be SUCCEEDED, got {right_run.status.value}", status_code=400)
     
-    # Aggregate totals for left run
-    left_totals = await session.execute(
-        select(
-            func.coalesce(func.sum(ImportRecord.spend), 0).label("spend"),
-            func.coalesce(func.sum(ImportRecord.clicks), 0).label("clicks"),
-            func.coalesce(func.sum(ImportRecord.conversions), 0).label("conversions"),
-        ).where(ImportRecord.run_id == left_run_id)
+    # Left and right are aggregated together with FILTER; the two queries are
+    # independent, so run them concurrently, each on its own session (an
+    # AsyncSession cannot have two queries in flight)
+    totals, campaign_rows = await asyncio.gather(
+        _compare_totals(left_run_id, right_run_id),
+        _top_changed_campaigns(left_run_id, right_run_id),
     )
-    left_row = left_totals.one()
-    left_spend = left_row.spend or Decimal(0)
-    left_clicks = left_row.clicks or Decimal(0)
-    left_conversions = left_row.conversions or Decimal(0)
-    
-    # Aggregate totals for right run
-    right_totals = await session.execute(
-        select(
-            func.coalesce(func.sum(ImportRecord.spend), 0).label("spend"),
-            func.coalesce(func.sum(ImportRecord.clicks), 0).label("clicks"),
-            func.coalesce(func.sum(ImportRecord.conversions), 0).label("conversions"),
-        ).where(ImportRecord.run_id == right_run_id)
-    )
-    right_row = right_totals.one()
-    right_spend = right_row.spend or Decimal(0)
-    right_clicks = right_row.clicks or Decimal(0)
-    right_conversions = right_row.conversions or Decimal(0)
-    
-    # Campaign-level aggregation for left run
-    left_campaigns_result = await session.execute(
-        select(
-            ImportRecord.campaign,
-            func.sum(ImportRecord.spend).label("spend"),
-        )
-        .where(ImportRecord.run_id == left_run_id)
-        .group_by(ImportRecord.campaign)
-    )
-    left_campaigns = {row.campaign: row.spend or Decimal(0) for row in left_campaigns_result.all()}
-    
-    # Campaign-level aggregation for right run
-    right_campaigns_result = await session.execute(
-        select(
-            ImportRecord.campaign,
-            func.sum(ImportRecord.spend).label("spend"),
+
+    top_changed = [
+        CampaignDiff.model_construct(
+            campaign=row.campaign,
+            spend_left=row.spend_left,
+            spend_right=row.spend_right,
+            delta=row.delta,
         )
-        .where(ImportRecord.run_id == right_run_id)
-        .group_by(ImportRecord.campaign)
-    )
-    right_campaigns = {row.campaign: row.spend or Decimal(0) for row in right_campaigns_result.all()}
-    
-    # Compute campaign diffs
-    all_campaigns = set(left_campaigns.keys()) | set(right_campaigns.keys())
-    campaign_diffs = []
-    for campaign in all_campaigns:
-        left_val = left_campaigns.get(campaign, Decimal(0))
-        right_val = right_campaigns.get(campaign, Decimal(0))
-        delta = right_val - left_val
-        campaign_diffs.append(CampaignDiff(
-            campaign=campaign,
-            spend_left=left_val,
-            spend_right=right_val,
-            delta=delta,
-        ))
-    
-    # Sort by absolute delta descending, take top 10
-    campaign_diffs.sort(key=lambda x: abs(x.delta), reverse=True)
-    top_changed = campaign_diffs[:10]
+        for row in campaign_rows
+    ]
     
     # Compute row counts
     left_error_rows = left_run.processed_rows - left_run.success_rows
@@ -200,9 +203,9 @@ async def compare_runs(
             total_rows=left_run.total_rows,
             success_rows=left_run.success_rows,
             error_rows=left_error_rows,
-            spend_total=left_spend,
-            clicks_total=left_clicks,
-            conversions_total=left_conversions,
+            spend_total=totals.left_spend,
+            clicks_total=totals.left_clicks,
+            conversions_total=totals.left_conversions,
         ),
         right_run=RunCompareSummary(
             id=str(right_run.id),
@@ -212,28 +215,28 @@ async def compare_runs(
             total_rows=right_run.total_rows,
             success_rows=right_run.success_rows,
             error_rows=right_error_rows,
-            spend_total=right_spend,
-            clicks_total=right_clicks,
-            conversions_total=right_conversions,
+            spend_total=totals.right_spend,
+            clicks_total=totals.right_clicks,
+            conversions_total=totals.right_conversions,
         ),
         diff=CompareDiff(
             total_rows=(right_run.total_rows or 0) - (left_run.total_rows or 0) if (left_run.total_rows and right_run.total_rows) else None,
             success_rows=right_run.success_rows - left_run.success_rows,
             error_rows=right_error_rows - left_error_rows,
             spend_total=SpendDiff(
-                left=left_spend,
-                right=right_spend,
-                delta=right_spend - left_spend,
+                left=totals.left_spend,
+                right=totals.right_spend,
+                delta=totals.delta_spend,
             ),
             clicks_total=SpendDiff(
-                left=left_clicks,
-                right=right_clicks,
-                delta=right_clicks - left_clicks,
+                left=totals.left_clicks,
+                right=totals.right_clicks,
+                delta=totals.delta_clicks,
             ),
             conversions_total=SpendDiff(
-                left=left_conversions,
-                right=right_conversions,
-                delta=right_conversions - left_conversions,
+                left=totals.left_conversions,
+                right=totals.right_conversions,
+                delta=totals.delta_conversions,
             ),
             top_changed_campaigns=top_changed,
         ),
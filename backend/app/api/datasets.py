@@ -1,19 +1,24 @@
+from typing import Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import insert, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
 from app.core.auth import get_current_user
 from app.core.org_context import require_active_org
 from app.core.storage import save_upload, InvalidFileError
 from app.db import get_session
+from app.models.orgs import Organization
 from app.models.user import User
 from app.models.imports import ImportDataset, ImportRun, ImportRunStatus
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
+RECENT_RUNS_LIMIT = 20
+
 
 def err(code: str, message: str, status_code: int = 400, details: dict | None = None) -> HTTPException:
     detail = {"error": {"code": code, "message": message}}
@@ -58,13 +63,25 @@ class RunSummaryResponse(BaseModel):
         from_attributes = True
 
 
+class RunListItem(BaseModel):
+    """Slim run row for list views (GET /datasets/{id}?fields=summary)."""
+
+    id: UUID
+    status: str
+    progress_percent: int
+    created_at: str
+
+    class Config:
+        from_attributes = True
+
+
 class DatasetWithRunsResponse(BaseModel):
     id: UUID
     name: str
     description: str | None
     created_at: str
     mapping: dict | None
-    runs: list[RunSummaryResponse]
+    runs: list[RunSummaryResponse] | list[RunListItem]
 
     class Config:
         from_attributes = True
@@ -78,21 +95,25 @@ async def create_dataset(
     body: CreateDatasetRequest,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
-    org_id, _ = await require_active_org(current_user, session)
-    dataset = ImportDataset(
-        name=body.name,
-        description=body.description,
-        org_id=org_id,
-        created_by_user_id=current_user.id,
+    org_id, _ = active_org
+    # RETURNING hands back the generated id and created_at with the insert itself
+    result = await session.execute(
+        insert(ImportDataset)
+        .values(
+            name=body.name,
+            description=body.description,
+            org_id=org_id,
+            created_by_user_id=current_user.id,
+        )
+        .returning(ImportDataset.id, ImportDataset.created_at)
     )
-    session.add(dataset)
-    await session.flush()
-    await session.refresh(dataset)
+    dataset = result.one()
     return DatasetResponse(
         id=dataset.id,
-        name=dataset.name,
-        description=dataset.description,
+        name=body.name,
+        description=body.description,
         created_at=dataset.created_at.isoformat(),
     )
 
@@ -102,52 +123,89 @@ async def list_datasets(
     skip: int = 0,
     take: int = 100,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
-    org_id, _ = await require_active_org(current_user, session)
+    org_id, _ = active_org
+    # Hot list path: project only the response columns and serialize the rows
+    # straight to JSON, skipping ORM hydration and per-row model validation
     result = await session.execute(
-        select(ImportDataset)
+        select(
+            ImportDataset.id,
+            ImportDataset.name,
+            ImportDataset.description,
+            ImportDataset.created_at,
+        )
         .where(ImportDataset.org_id == org_id)
         .order_by(ImportDataset.created_at.desc())
         .offset(skip)
         .limit(take)
     )
-    rows = result.scalars().all()
-    return [
-        DatasetResponse(
-            id=d.id,
-            name=d.name,
-            description=d.description,
-            created_at=d.created_at.isoformat(),
-        )
-        for d in rows
-    ]
+    return ORJSONResponse([dict(row) for row in result.mappings()])
 
 
 @router.get("/{dataset_id}", response_model=DatasetWithRunsResponse)
 async def get_dataset(
     dataset_id: UUID,
+    fields: Literal["summary", "full"] = Query("full"),
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
-    org_id, _ = await require_active_org(current_user, session)
+    """
+    Dataset with its most recent runs. fields=summary returns only
+    id/status/progress_percent/created_at per run (and selects only those).
+    """
+    org_id, _ = active_org
+    run_columns = [
+        ImportRun.id,
+        ImportRun.status,
+        ImportRun.progress_percent,
+        ImportRun.created_at,
+    ]
+    if fields == "full":
+        run_columns += [
+            ImportRun.dataset_id,
+            ImportRun.total_rows,
+            ImportRun.processed_rows,
+            ImportRun.success_rows,
+            ImportRun.error_rows,
+            ImportRun.started_at,
+            ImportRun.finished_at,
+            ImportRun.schema_version,
+        ]
+    # Dataset and its recent runs (limited in SQL, requested columns only) in one
+    # round trip; the outer join keeps the dataset row when it has no runs
+    recent_runs = (
+        select(*run_columns)
+        .where(ImportRun.dataset_id == ImportDataset.id)
+        .order_by(ImportRun.created_at.desc())
+        .limit(RECENT_RUNS_LIMIT)
+        .lateral("recent_runs")
+    )
     result = await session.execute(
-        select(ImportDataset)
+        select(ImportDataset, recent_runs)
+        .outerjoin(recent_runs, true())
         .where(ImportDataset.id == dataset_id, ImportDataset.org_id == org_id)
-        .options(selectinload(ImportDataset.runs))
+        .order_by(recent_runs.c.created_at.desc())
     )
-    dataset = result.scalar_one_or_none()
-    if not dataset:
+    rows = result.all()
+    if not rows:
         raise err("not_found", "Dataset not found", status_code=404)
-    runs = dataset.runs[:20]  # recent 20
-    return DatasetWithRunsResponse(
-        id=dataset.id,
-        name=dataset.name,
-        description=dataset.description,
-        created_at=dataset.created_at.isoformat(),
-        mapping=dataset.mapping_json,
-        runs=[
-            RunSummaryResponse(
+    dataset = rows[0][0]
+    runs = [row for row in rows if row.id is not None]
+    # Rows come straight from the database: skip per-run validation
+    if fields == "summary":
+        run_items = [
+            RunListItem.model_construct(
+                id=r.id,
+                status=r.status.value,
+                progress_percent=r.progress_percent,
+                created_at=r.created_at.isoformat(),
+            )
+            for r in runs
+        ]
+    else:
+        run_items = [
+            RunSummaryResponse.model_construct(
                 id=r.id,
                 dataset_id=r.dataset_id,
                 status=r.status.value,
@@ -162,13 +220,20 @@ async def get_dataset(
                 schema_version=r.schema_version,
             )
             for r in runs
-        ],
+        ]
+    return DatasetWithRunsResponse(
+        id=dataset.id,
+        name=dataset.name,
+        description=dataset.description,
+        created_at=dataset.created_at.isoformat(),
+        mapping=dataset.mapping_json,
+        runs=run_items,
     )
 
 
 # Mapping schema: canonical field -> { source: str, format?: str, currency?: bool, default?: number }
-CANONICAL_REQUIRED = {"date", "campaign", "channel", "spend"}
-CANONICAL_OPTIONAL = {"clicks", "conversions"}
+CANONICAL_REQUIRED = frozenset({"date", "campaign", "channel", "spend"})
+CANONICAL_OPTIONAL = frozenset({"clicks", "conversions"})
 CANONICAL_FIELDS = CANONICAL_REQUIRED | CANONICAL_OPTIONAL
 
 
@@ -187,22 +252,21 @@ def _validate_mapping(mapping: dict) -> None:
     """Raise HTTPException if mapping is invalid."""
     if not mapping or not isinstance(mapping, dict):
         raise err("invalid_mapping", "Mapping must be a non-empty object", status_code=400)
-    for key in CANONICAL_REQUIRED:
-        if key not in mapping:
-            raise err("invalid_mapping", f"Required field '{key}' is missing", status_code=400)
-        m = mapping.get(key)
-        if not isinstance(m, dict) or not (m.get("source") or "").strip():
-            raise err("invalid_mapping", f"Field '{key}' must have a non-empty 'source' column", status_code=400)
-    for key in list(mapping.keys()):
+    # Single pass over the entries; required fields not seen are reported afterwards
+    for key, m in mapping.items():
         if key not in CANONICAL_FIELDS:
             raise err("invalid_mapping", f"Unknown field '{key}'", status_code=400)
-    for key in CANONICAL_OPTIONAL:
-        if key in mapping:
-            m = mapping[key]
-            if not isinstance(m, dict):
-                raise err("invalid_mapping", f"Field '{key}' must be an object", status_code=400)
-            if m.get("source") is not None and not str(m.get("source", "")).strip():
-                raise err("invalid_mapping", f"Field '{key}' source cannot be empty if set", status_code=400)
+        if not isinstance(m, dict):
+            raise err("invalid_mapping", f"Field '{key}' must be an object", status_code=400)
+        source = m.get("source")
+        if key in CANONICAL_REQUIRED:
+            if not (source or "").strip():
+                raise err("invalid_mapping", f"Field '{key}' must have a non-empty 'source' column", status_code=400)
+        elif source is not None and not str(source).strip():
+            raise err("invalid_mapping", f"Field '{key}' source cannot be empty if set", status_code=400)
+    missing = CANONICAL_REQUIRED - mapping.keys()
+    if missing:
+        raise err("invalid_mapping", f"Required field '{min(missing)}' is missing", status_code=400)
 
 
 @router.put("/{dataset_id}/mapping")
@@ -210,10 +274,10 @@ async def put_dataset_mapping(
     dataset_id: UUID,
     body: PutMappingRequest,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
     """Set dataset column mapping. Validates required canonical fields."""
-    org_id, _ = await require_active_org(current_user, session)
+    org_id, _ = active_org
     result = await session.execute(
         select(ImportDataset).where(
             ImportDataset.id == dataset_id,
@@ -223,9 +287,10 @@ async def put_dataset_mapping(
     dataset = result.scalar_one_or_none()
     if not dataset:
         raise err("not_found", "Dataset not found", status_code=404)
-    _validate_mapping(body.mapping)
-    dataset.mapping_json = body.mapping
-    await session.flush()
+    # Validate and store plain JSON objects, not the request models
+    mapping = {key: field.model_dump(exclude_none=True) for key, field in body.mapping.items()}
+    _validate_mapping(mapping)
+    dataset.mapping_json = mapping
     await session.commit()
     return {"ok": True}
 
@@ -235,49 +300,74 @@ async def upload_csv(
     dataset_id: UUID,
     file: UploadFile = File(...),
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    active_org: tuple[UUID, Organization] = Depends(require_active_org),
 ):
-    org_id, _ = await require_active_org(current_user, session)
+    org_id, _ = active_org
+    # Create the DRAFT run only if the dataset exists in the active org: the
+    # existence check and the insert share one round trip
     result = await session.execute(
-        select(ImportDataset).where(
-            ImportDataset.id == dataset_id,
-            ImportDataset.org_id == org_id,
+        insert(ImportRun)
+        .from_select(
+            ["dataset_id"],
+            select(ImportDataset.id).where(
+                ImportDataset.id == dataset_id,
+                ImportDataset.org_id == org_id,
+            ),
         )
+        .returning(ImportRun.id)
     )
-    dataset = result.scalar_one_or_none()
-    if not dataset:
+    run_id = result.scalar_one_or_none()
+    if run_id is None:
         raise err("not_found", "Dataset not found", status_code=404)
 
-    # Check for duplicate upload (same SHA256, same dataset, SUCCEEDED status)
-    # We'll compute SHA256 during upload, but first create the run
-    run = ImportRun(
-        dataset_id=dataset_id,
-        status=ImportRunStatus.DRAFT,
-        file_path=None,
-    )
-    session.add(run)
-    await session.flush()
-
     try:
-        upload_result = await save_upload(file, org_id, dataset_id, run.id)
+        upload_result = await save_upload(file, org_id, dataset_id, run_id)
     except InvalidFileError as e:
         await session.rollback()
         raise err(e.code, e.message, status_code=400) from e
 
-    # Check for duplicate upload
-    existing_run = await session.execute(
-        select(ImportRun)
-        .join(ImportDataset)
-        .where(
-            ImportRun.file_sha256 == upload_result.sha256,
-            ImportDataset.id == dataset_id,
-            ImportRun.status == ImportRunStatus.SUCCEEDED,
+    # Record the file on the run unless a SUCCEEDED run of this dataset already has
+    # the same content; the duplicate check is part of the UPDATE, so it is atomic
+    # and costs no extra round trip on the common (non-duplicate) path
+    existing_run = aliased(ImportRun)
+    succeeded_duplicate = select(existing_run.id).where(
+        existing_run.dataset_id == dataset_id,
+        existing_run.file_sha256 == upload_result.sha256,
+        existing_run.status == ImportRunStatus.SUCCEEDED,
+    )
+    result = await session.execute(
+        update(ImportRun)
+        .where(ImportRun.id == run_id, ~succeeded_duplicate.exists())
+        .values(
+            file_storage=upload_result.storage,
+            file_path=upload_result.file_path,
+            s3_bucket=upload_result.s3_bucket,
+            s3_key=upload_result.s3_key,
+            file_sha256=upload_result.sha256,
+            file_size_bytes=upload_result.size_bytes,
+        )
+        .returning(
+            ImportRun.id,
+            ImportRun.dataset_id,
+            ImportRun.status,
+            ImportRun.progress_percent,
+            ImportRun.total_rows,
+            ImportRun.processed_rows,
+            ImportRun.success_rows,
+            ImportRun.error_rows,
+            ImportRun.created_at,
+            ImportRun.started_at,
+            ImportRun.finished_at,
+            ImportRun.schema_version,
         )
-        .order_by(ImportRun.created_at.desc())
-        .limit(1)
     )
-    duplicate = existing_run.scalar_one_or_none()
-    if duplicate:
+    run = result.one_or_none()
+    if run is None:
+        duplicate_id = (
+            await session.execute(
+                succeeded_duplicate.order_by(existing_run.created_at.desc()).limit(1)
+            )
+        ).scalar_one()
         await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -285,21 +375,12 @@ async def upload_csv(
                 "error": {
                     "code": "DUPLICATE_UPLOAD",
                     "message": "A run with the same file content already exists",
-                    "details": {"existing_run_id": str(duplicate.id)},
+                    "details": {"existing_run_id": str(duplicate_id)},
                 }
             },
         )
-
-    run.file_storage = upload_result.storage
-    run.file_path = upload_result.file_path
-    run.s3_bucket = upload_result.s3_bucket
-    run.s3_key = upload_result.s3_key
-    run.file_sha256 = upload_result.sha256
-    run.file_size_bytes = upload_result.size_bytes
-    await session.flush()
     await session.commit()
 
-    await session.refresh(run)
     return RunSummaryResponse(
         id=run.id,
         dataset_id=run.dataset_id,
@@ -2,9 +2,11 @@
 Demo metadata endpoint: returns dataset and run IDs for the seeded demo.
 Public, no auth required.
 """
+import asyncio
+import time
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from sqlalchemy import select
 
@@ -15,6 +17,12 @@ router = APIRouter(prefix="/demo", tags=["demo"])
 
 DATASET_NAME = "Demo: Marketing Spend"
 ORG_NAME = "Demo Workspace"
+# Demo IDs only change on reseed; serve them from memory in between
+DEMO_METADATA_TTL_SECONDS = 300
+
+# (fetched_at monotonic, metadata) of the last lookup
+_demo_cache: tuple[float, "DemoMetadata | None"] | None = None
+_demo_lock = asyncio.Lock()
 
 
 class DemoMetadata(BaseModel):
@@ -25,12 +33,40 @@ class DemoMetadata(BaseModel):
     dataset_name: str
 
 
+def _cached_demo_metadata() -> tuple[bool, DemoMetadata | None]:
+    """(hit, metadata) from the process-local cache."""
+    if _demo_cache is None:
+        return False, None
+    fetched_at, metadata = _demo_cache
+    if time.monotonic() - fetched_at >= DEMO_METADATA_TTL_SECONDS:
+        return False, None
+    return True, metadata
+
+
 @router.get("", response_model=DemoMetadata | None)
-async def get_demo_metadata() -> DemoMetadata | None:
+async def get_demo_metadata(response: Response) -> DemoMetadata | None:
     """
     Return demo dataset and run IDs if seeded.
     Used by /demo page for deep links to compare, results, etc.
+    Cached in-process (and by clients) for DEMO_METADATA_TTL_SECONDS.
     """
+    global _demo_cache
+
+    response.headers["Cache-Control"] = f"public, max-age={DEMO_METADATA_TTL_SECONDS}"
+    hit, metadata = _cached_demo_metadata()
+    if hit:
+        return metadata
+    async with _demo_lock:
+        # Another request may have refreshed the cache while we waited
+        hit, metadata = _cached_demo_metadata()
+        if hit:
+            return metadata
+        metadata = await _load_demo_metadata()
+        _demo_cache = (time.monotonic(), metadata)
+        return metadata
+
+
+async def _load_demo_metadata() -> DemoMetadata | None:
     from app.models.orgs import Organization
 
     async with async_session_factory() as session:
@@ -48,23 +84,22 @@ async def get_demo_metadata() -> DemoMetadata | None:
 
         # Get Run A (schema v1) and Run B (schema v2) - both SUCCEEDED
         runs_result = await session.execute(
-            select(ImportRun)
-            .where(
+            select(ImportRun.schema_version, ImportRun.id).where(
                 ImportRun.dataset_id == dataset.id,
                 ImportRun.status == ImportRunStatus.SUCCEEDED,
+                ImportRun.schema_version.in_([1, 2]),
             )
-            .order_by(ImportRun.schema_version.asc())
         )
-        runs = list(runs_result.scalars().all())
-        run_a = next((r for r in runs if r.schema_version == 1), None)
-        run_b = next((r for r in runs if r.schema_version == 2), None)
-        if not run_a or not run_b:
+        run_ids = {row.schema_version: row.id for row in runs_result.all()}
+        run_a_id = run_ids.get(1)
+        run_b_id = run_ids.get(2)
+        if not run_a_id or not run_b_id:
             return None
 
         return DemoMetadata(
             dataset_id=str(dataset.id),
-            run_a_id=str(run_a.id),
-            run_b_id=str(run_b.id),
+            run_a_id=str(run_a_id),
+            run_b_id=str(run_b_id),
             org_name=ORG_NAME,
             dataset_name=DATASET_NAME,
         )
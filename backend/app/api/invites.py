@@ -1,7 +1,7 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
@@ -72,7 +72,7 @@ async def get_invite(
         role=invite.role.value,
         expires_at=invite.expires_at.isoformat(),
         created_at=invite.created_at.isoformat(),
-        accepted_at=invite.accepted_at.isoformat() if invite.accepted_at else None,
+        accepted_at=None,
     )
 
 
@@ -83,12 +83,22 @@ async def accept_invite(
     session: AsyncSession = Depends(get_session),
 ):
     """Accept an organization invite. Requires authentication."""
+    # Invite and the caller's existing membership in its org in one round trip
+    is_member = (
+        exists()
+        .where(
+            OrganizationMember.org_id == OrganizationInvite.org_id,
+            OrganizationMember.user_id == current_user.id,
+        )
+        .label("is_member")
+    )
     result = await session.execute(
-        select(OrganizationInvite).where(OrganizationInvite.token == token)
+        select(OrganizationInvite, is_member).where(OrganizationInvite.token == token)
     )
-    invite = result.scalar_one_or_none()
-    if not invite:
+    row = result.first()
+    if not row:
         raise err("not_found", "Invite not found", status_code=404)
+    invite, already_member = row
 
     # Check expiry
     if invite.expires_at < datetime.now(timezone.utc):
@@ -107,25 +117,17 @@ async def accept_invite(
         )
 
     # Check if already a member
-    existing_result = await session.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.org_id == invite.org_id,
-            OrganizationMember.user_id == current_user.id,
-        )
-    )
-    if existing_result.scalar_one_or_none():
+    if already_member:
         raise err("already_member", "You are already a member of this organization", status_code=400)
 
-    # Create membership
-    from uuid import uuid4
-
-    membership = OrganizationMember(
-        id=uuid4(),
-        org_id=invite.org_id,
-        user_id=current_user.id,
-        role=invite.role,
+    # Create membership (nothing server-generated is needed back, so no reload)
+    await session.execute(
+        insert(OrganizationMember).values(
+            org_id=invite.org_id,
+            user_id=current_user.id,
+            role=invite.role,
+        )
     )
-    session.add(membership)
 
     # Mark invite as accepted
     invite.accepted_at = datetime.now(timezone.utc)
@@ -135,6 +137,5 @@ async def accept_invite(
         current_user.active_org_id = invite.org_id
 
     await session.commit()
-    await session.refresh(membership)
 
     return {"ok": True, "org_id": str(invite.org_id)}
@@ -1,13 +1,18 @@
-from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
-from sqlalchemy import func, select
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy import exists, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.core.auth import get_current_user
 from app.core.org_context import (
+    get_org_member,
+    load_org_if_member,
     require_active_org,
-    require_org_member,
     require_org_role,
     get_active_org_id,
 )
@@ -18,6 +23,9 @@ from app.models.orgs import Organization, OrganizationMember, OrganizationInvite
 
 router = APIRouter(prefix="/orgs", tags=["orgs"])
 
+# Current user + their membership in the path's org_id, loaded in one query
+OrgMember = Annotated[tuple[User, OrganizationMember], Depends(get_org_member)]
+
 
 def err(code: str, message: str, status_code: int = 400) -> HTTPException:
     return HTTPException(
@@ -32,10 +40,9 @@ def err(code: str, message: str, status_code: int = 400) -> HTTPException:
 class OrganizationResponse(BaseModel):
     id: UUID
     name: str
-    created_at: str
+    created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrganizationListResponse(BaseModel):
@@ -57,10 +64,9 @@ class MemberResponse(BaseModel):
     role: str
     user_email: str
     user_name: str
-    created_at: str
+    created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MembersListResponse(BaseModel):
@@ -76,12 +82,11 @@ class InviteResponse(BaseModel):
     org_id: UUID
     email: str
     role: str
-    expires_at: str
-    created_at: str
-    accepted_at: str | None
+    expires_at: datetime
+    created_at: datetime
+    accepted_at: datetime | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InvitesListResponse(BaseModel):
@@ -102,17 +107,18 @@ async def list_orgs(
     session: AsyncSession = Depends(get_session),
 ):
     """List all organizations the current user belongs to."""
+    # Columns only: no ORM hydration per org
     result = await session.execute(
-        select(Organization)
+        select(Organization.id, Organization.name, Organization.created_at)
         .join(OrganizationMember, Organization.id == OrganizationMember.org_id)
         .where(OrganizationMember.user_id == current_user.id)
         .order_by(Organization.created_at.desc())
     )
-    orgs = result.scalars().all()
-    return OrganizationListResponse(
+    # Rows come straight from the database: skip per-item validation
+    return OrganizationListResponse.model_construct(
         items=[
-            OrganizationResponse(id=o.id, name=o.name, created_at=o.created_at.isoformat())
-            for o in orgs
+            OrganizationResponse.model_construct(id=o.id, name=o.name, created_at=o.created_at)
+            for o in result
         ]
     )
 
@@ -124,8 +130,6 @@ async def create_org(
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new organization. Creator becomes OWNER."""
-    from uuid import uuid4
-
     org = Organization(
         id=uuid4(),
         name=body.name,
@@ -140,10 +144,10 @@ async def create_org(
         role=OrgMemberRole.OWNER,
     )
     session.add(membership)
+    # created_at comes back via INSERT ... RETURNING at flush (eager defaults), no reload
     await session.commit()
-    await session.refresh(org)
 
-    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at.isoformat())
+    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at)
 
 
 @router.get("/{org_id}", response_model=OrganizationResponse)
@@ -153,12 +157,11 @@ async def get_org(
     session: AsyncSession = Depends(get_session),
 ):
     """Get organization details. Requires membership."""
-    await require_org_member(org_id, current_user, session)
-    result = await session.execute(select(Organization).where(Organization.id == org_id))
-    org = result.scalar_one_or_none()
-    if not org:
-        raise err("not_found", "Organization not found", status_code=404)
-    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at.isoformat())
+    loaded = await load_org_if_member(org_id, current_user, session)
+    if not loaded:
+        raise err("not_member", "Not a member of this organization", status_code=404)
+    org, _ = loaded
+    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at)
 
 
 @router.patch("/{org_id}", response_model=OrganizationResponse)
@@ -169,58 +172,65 @@ async def update_org(
     session: AsyncSession = Depends(get_session),
 ):
     """Update organization name. Requires OWNER or ADMIN role."""
-    await require_org_role(org_id, [OrgMemberRole.OWNER, OrgMemberRole.ADMIN], current_user, session)
-    result = await session.execute(select(Organization).where(Organization.id == org_id))
-    org = result.scalar_one_or_none()
-    if not org:
-        raise err("not_found", "Organization not found", status_code=404)
+    loaded = await load_org_if_member(org_id, current_user, session)
+    if not loaded:
+        raise err("not_member", "Not a member of this organization", status_code=404)
+    org, membership = loaded
+    if membership.role not in (OrgMemberRole.OWNER, OrgMemberRole.ADMIN):
+        raise err("insufficient_permissions", "Requires one of: OWNER, ADMIN", status_code=403)
     org.name = body.name
     await session.commit()
-    await session.refresh(org)
-    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at.isoformat())
+    return OrganizationResponse(id=org.id, name=org.name, created_at=org.created_at)
 
 
 @router.post("/{org_id}/activate")
 async def activate_org(
     org_id: UUID,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """Set this organization as the user's active org. Requires membership."""
-    await require_org_member(org_id, current_user, session)
+    current_user, _ = member
     current_user.active_org_id = org_id
     await session.commit()
-    await session.refresh(current_user)
     return {"ok": True, "active_org_id": str(org_id)}
 
 
 @router.get("/{org_id}/members", response_model=MembersListResponse)
 async def list_members(
     org_id: UUID,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """List organization members. Requires membership."""
-    await require_org_member(org_id, current_user, session)
+    # Columns only: no ORM hydration of a member and a user per row
     result = await session.execute(
-        select(OrganizationMember, User)
+        select(
+            OrganizationMember.id,
+            OrganizationMember.org_id,
+            OrganizationMember.user_id,
+            OrganizationMember.role,
+            User.email.label("user_email"),
+            User.name.label("user_name"),
+            OrganizationMember.created_at,
+        )
         .join(User, OrganizationMember.user_id == User.id)
         .where(OrganizationMember.org_id == org_id)
         .order_by(OrganizationMember.created_at.desc())
     )
-    rows = result.all()
-    return MembersListResponse(
+    # Rows come straight from the database: skip per-item validation
+    return MembersListResponse.model_construct(
         items=[
-            MemberResponse(
-                id=m.id,
-                org_id=m.org_id,
-                user_id=m.user_id,
-                role=m.role.value,
-                user_email=u.email,
-                user_name=u.name,
-                created_at=m.created_at.isoformat(),
+            MemberResponse.model_construct(
+                id=row.id,
+                org_id=row.org_id,
+                user_id=row.user_id,
+                role=row.role.value,
+                user_email=row.user_email,
+                user_name=row.user_name,
+                created_at=row.created_at,
             )
-            for m, u in rows
+            for row in result
         ]
     )
 
@@ -230,93 +240,94 @@ async def update_member(
     org_id: UUID,
     user_id: UUID,
     body: UpdateMemberRequest,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """Update member role. Requires OWNER role."""
+    current_user, _ = member
     await require_org_owner(org_id, current_user, session)
+    # UPDATE ... FROM users RETURNING: role change and response fields in one statement
     result = await session.execute(
-        select(OrganizationMember).where(
+        update(OrganizationMember)
+        .where(
             OrganizationMember.org_id == org_id,
             OrganizationMember.user_id == user_id,
+            User.id == OrganizationMember.user_id,
+        )
+        .values(role=body.role)
+        .returning(
+            OrganizationMember.id,
+            OrganizationMember.created_at,
+            User.email,
+            User.name,
         )
     )
-    membership = result.scalar_one_or_none()
-    if not membership:
+    row = result.one_or_none()
+    if not row:
         raise err("not_found", "Member not found", status_code=404)
-    membership.role = body.role
     await session.commit()
-    await session.refresh(membership)
-    user_result = await session.execute(select(User).where(User.id == user_id))
-    user = user_result.scalar_one()
     return MemberResponse(
-        id=membership.id,
-        org_id=membership.org_id,
-        user_id=membership.user_id,
-        role=membership.role.value,
-        user_email=user.email,
-        user_name=user.name,
-        created_at=membership.created_at.isoformat(),
+        id=row.id,
+        org_id=org_id,
+        user_id=user_id,
+        role=body.role.value,
+        user_email=row.email,
+        user_name=row.name,
+        created_at=row.created_at,
     )
 
 
-@router.delete("/{org_id}/members/{user_id}")
+@router.delete("/{org_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_member(
     org_id: UUID,
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """Remove member from organization. Requires OWNER role. Cannot remove last OWNER."""
+    current_user, _ = member
     await require_org_owner(org_id, current_user, session)
-    
-    # Check if this is the last OWNER
-    result = await session.execute(
-        select(func.count()).select_from(OrganizationMember).where(
-            OrganizationMember.org_id == org_id,
-            OrganizationMember.role == OrgMemberRole.OWNER,
+
+    # Target membership plus whether any other OWNER exists, in one query; EXISTS stops
+    # at the first other owner instead of counting them all
+    other_owner = aliased(OrganizationMember)
+    has_other_owner = (
+        exists()
+        .where(
+            other_owner.org_id == org_id,
+            other_owner.role == OrgMemberRole.OWNER,
+            other_owner.user_id != user_id,
         )
+        .label("has_other_owner")
     )
-    owner_count = result.scalar() or 0
-    if owner_count <= 1:
-        result = await session.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.org_id == org_id,
-                OrganizationMember.user_id == user_id,
-            )
-        )
-        membership = result.scalar_one_or_none()
-        if membership and membership.role == OrgMemberRole.OWNER:
-            raise err("cannot_remove_last_owner", "Cannot remove the last OWNER", status_code=400)
-    
     result = await session.execute(
-        select(OrganizationMember).where(
+        select(OrganizationMember, has_other_owner).where(
             OrganizationMember.org_id == org_id,
             OrganizationMember.user_id == user_id,
         )
     )
-    membership = result.scalar_one_or_none()
-    if not membership:
+    row = result.one_or_none()
+    if not row:
         raise err("not_found", "Member not found", status_code=404)
-    
+    membership, other_owner_exists = row
+    if membership.role == OrgMemberRole.OWNER and not other_owner_exists:
+        raise err("cannot_remove_last_owner", "Cannot remove the last OWNER", status_code=400)
+
     await session.delete(membership)
     await session.commit()
-    return {"ok": True}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/{org_id}/invites", response_model=InviteResponse)
 async def create_invite(
     org_id: UUID,
     body: CreateInviteRequest,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """Create an organization invite. Requires OWNER or ADMIN role."""
+    current_user, _ = member
     await require_org_role(org_id, [OrgMemberRole.OWNER, OrgMemberRole.ADMIN], current_user, session)
-    
-    from uuid import uuid4
-    import secrets
-    from datetime import datetime, timedelta, timezone
 
     token = secrets.token_urlsafe(32)
     expires_at = datetime.now(timezone.utc) + timedelta(days=7)
@@ -331,27 +342,28 @@ async def create_invite(
         created_by_user_id=current_user.id,
     )
     session.add(invite)
+    # created_at comes back via INSERT ... RETURNING at flush (eager defaults), no reload
     await session.commit()
-    await session.refresh(invite)
 
     return InviteResponse(
         id=invite.id,
         org_id=invite.org_id,
         email=invite.email,
         role=invite.role.value,
-        expires_at=invite.expires_at.isoformat(),
-        created_at=invite.created_at.isoformat(),
-        accepted_at=invite.accepted_at.isoformat() if invite.accepted_at else None,
+        expires_at=invite.expires_at,
+        created_at=invite.created_at,
+        accepted_at=invite.accepted_at,
     )
 
 
 @router.get("/{org_id}/invites", response_model=InvitesListResponse)
 async def list_invites(
     org_id: UUID,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """List organization invites. Requires OWNER or ADMIN role."""
+    current_user, _ = member
     await require_org_admin_or_owner(org_id, current_user, session)
     result = await session.execute(
         select(OrganizationInvite)
@@ -359,40 +371,36 @@ async def list_invites(
         .order_by(OrganizationInvite.created_at.desc())
     )
     invites = result.scalars().all()
-    return InvitesListResponse(
+    # Rows come straight from the database: skip per-item validation
+    return InvitesListResponse.model_construct(
         items=[
-            InviteResponse(
+            InviteResponse.model_construct(
                 id=i.id,
                 org_id=i.org_id,
                 email=i.email,
                 role=i.role.value,
-                expires_at=i.expires_at.isoformat(),
-                created_at=i.created_at.isoformat(),
-                accepted_at=i.accepted_at.isoformat() if i.accepted_at else None,
+                expires_at=i.expires_at,
+                created_at=i.created_at,
+                accepted_at=i.accepted_at,
             )
             for i in invites
         ]
     )
 
 
-@router.delete("/{org_id}/invites/{invite_id}")
+@router.delete("/{org_id}/invites/{invite_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_invite(
     org_id: UUID,
     invite_id: UUID,
-    current_user: User = Depends(get_current_user),
+    member: OrgMember,
     session: AsyncSession = Depends(get_session),
 ):
     """Revoke an organization invite. Requires OWNER or ADMIN role."""
+    current_user, _ = member
     await require_org_admin_or_owner(org_id, current_user, session)
-    result = await session.execute(
-        select(OrganizationInvite).where(
-            OrganizationInvite.id == invite_id,
-            OrganizationInvite.org_id == org_id,
-        )
-    )
-    invite = result.scalar_one_or_none()
-    if not invite:
+    invite = await session.get(OrganizationInvite, invite_id)
+    if not invite or invite.org_id != org_id:
         raise err("not_found", "Invite not found", status_code=404)
     await session.delete(invite)
     await session.commit()
-    return {"ok": True}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,23 @@
 import csv
 import io
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.sql.base import ExecutableOption
 
+from app.config import settings
 from app.core.auth import get_current_user
-from app.core.org_context import require_active_org, require_org_member
+from app.core.org_context import get_active_org_id, require_org_member
 from app.core.sse import stream_run_events
 from app.core.storage import read_csv_header, read_csv_header_for_run, presign_download_url, resolve_run_file_path
 from app.core.celery_app import enqueue_import_run
 from app.db import get_session
 from app.models.user import User
+from app.models.orgs import OrganizationMember
 from app.models.imports import (
     ImportRun,
     ImportRunAttempt,
@@ -35,6 +38,11 @@ SSE_HEADERS = {
 
 MAX_ERRORS = 50
 
+# Filtered record counts of finished runs never change (a retry gets a new finished_at),
+# so keep them per process: (run_id, finished_at, search, channel, min_spend) -> count
+RECORD_COUNT_CACHE_MAX_ENTRIES = 1024
+_record_count_cache: dict[tuple, int] = {}
+
 
 def err(code: str, message: str, status_code: int = 400, details: dict | None = None) -> HTTPException:
     detail = {"error": {"code": code, "message": message}}
@@ -118,19 +126,35 @@ class RecordsListResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_after_row: int | None = None
 
 
-async def _run_in_active_org(
-    session: AsyncSession, run_id: UUID, org_id: UUID
+async def _authorized_run(
+    session: AsyncSession, current_user: User, run_id: UUID, *options: ExecutableOption
 ) -> ImportRun | None:
-    """Return ImportRun if it belongs to a dataset in the specified org, else None."""
+    """
+    Return the run if its dataset is in the user's active org and the user is a member of it,
+    else None. Authorization and the run fetch are one query. Loader options are applied to it:
+    pass contains_eager(ImportRun.dataset) to populate run.dataset from the join already made.
+    """
+    org_id = await get_active_org_id(current_user, session)
+    if not org_id:
+        raise err("no_active_org", "No active organization", status_code=403)
     result = await session.execute(
         select(ImportRun)
         .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
+        .join(
+            OrganizationMember,
+            and_(
+                OrganizationMember.org_id == ImportDataset.org_id,
+                OrganizationMember.user_id == current_user.id,
+            ),
+        )
         .where(
             ImportRun.id == run_id,
             ImportDataset.org_id == org_id,
         )
+        .options(*options)
     )
     return result.scalar_one_or_none()
 
@@ -151,10 +175,7 @@ async def get_run_download(
     current_user: User = Depends(get_current_user),
 ):
     """Get presigned download URL for the uploaded CSV (S3) or relative path (disk)."""
-    from app.config import settings
-
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     if run.file_storage == "s3" and run.s3_bucket and run.s3_key:
@@ -177,12 +198,20 @@ async def stream_run_download(
     """Stream the raw uploaded CSV file (disk storage only)."""
     from fastapi.responses import FileResponse
 
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     if run.file_storage != "disk" or not run.file_path:
         raise err("no_file", "Direct download only for disk storage", status_code=400)
+    if settings.DOWNLOAD_X_ACCEL_PREFIX:
+        # nginx serves the file itself (sendfile) from its internal location
+        return Response(
+            media_type="text/csv",
+            headers={
+                "X-Accel-Redirect": f"{settings.DOWNLOAD_X_ACCEL_PREFIX}{run.file_path}",
+                "Content-Disposition": f'attachment; filename="run-{run_id}.csv"',
+            },
+        )
     path = resolve_run_file_path(run.file_path)
     if not path.exists():
         raise err("file_not_found", "File not found", status_code=404)
@@ -200,8 +229,7 @@ async def get_run_header(
     current_user: User = Depends(get_current_user),
 ):
     """Return CSV header columns for the run's uploaded file."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     if run.file_storage == "disk" and not run.file_path:
@@ -224,21 +252,31 @@ async def get_run_attempts(
     current_user: User = Depends(get_current_user),
 ):
     """List attempt history for a run. Requires membership in dataset's org."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
+    # Columns only: no ORM hydration per attempt
     result = await session.execute(
-        select(ImportRunAttempt)
+        select(
+            ImportRunAttempt.id,
+            ImportRunAttempt.attempt_number,
+            ImportRunAttempt.status,
+            ImportRunAttempt.started_at,
+            ImportRunAttempt.finished_at,
+            ImportRunAttempt.error_message,
+            ImportRunAttempt.traceback,
+            ImportRunAttempt.created_at,
+        )
         .where(ImportRunAttempt.run_id == run_id)
         .order_by(ImportRunAttempt.attempt_number.desc())
     )
-    attempts = result.scalars().all()
-    return AttemptsListResponse(
+    attempts = result.all()
+    # Rows come straight from the database: skip per-item validation
+    return AttemptsListResponse.model_construct(
         items=[
-            AttemptResponse(
+            AttemptResponse.model_construct(
                 id=a.id,
-                run_id=a.run_id,
+                run_id=run_id,
                 attempt_number=a.attempt_number,
                 status=a.status.value,
                 started_at=a.started_at.isoformat(),
@@ -259,8 +297,7 @@ async def retry_run(
     current_user: User = Depends(get_current_user),
 ):
     """Re-queue a failed or DLQ run. Sets dlq=false, status=QUEUED, enqueues job."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     if run.status != ImportRunStatus.FAILED and not run.dlq:
@@ -283,17 +320,7 @@ async def start_run(
     current_user: User = Depends(get_current_user),
 ):
     """Set run to QUEUED and enqueue Celery task. Run must be DRAFT and dataset must have mapping."""
-    org_id, _ = await require_active_org(current_user, session)
-    result = await session.execute(
-        select(ImportRun)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportRun.id == run_id,
-            ImportDataset.org_id == org_id,
-        )
-        .options(selectinload(ImportRun.dataset))
-    )
-    run = result.scalar_one_or_none()
+    run = await _authorized_run(session, current_user, run_id, contains_eager(ImportRun.dataset))
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     if run.status != ImportRunStatus.DRAFT:
@@ -304,7 +331,6 @@ async def start_run(
     if run.schema_version is None:
         run.schema_version = run.dataset.active_schema_version
     run.status = ImportRunStatus.QUEUED
-    await session.flush()
     await session.commit()
     enqueue_import_run(str(run.id))
     return {"ok": True, "run_id": str(run.id)}
@@ -337,18 +363,7 @@ async def rerun(
     current_user: User = Depends(get_current_user),
 ):
     """Create a new run from an existing run's file, optionally with a different schema version."""
-    org_id, _ = await require_active_org(current_user, session)
-    # Get original run
-    result = await session.execute(
-        select(ImportRun)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportRun.id == run_id,
-            ImportDataset.org_id == org_id,
-        )
-        .options(selectinload(ImportRun.dataset))
-    )
-    original_run = result.scalar_one_or_none()
+    original_run = await _authorized_run(session, current_user, run_id, contains_eager(ImportRun.dataset))
     if not original_run:
         raise err("not_found", "Run not found", status_code=404)
 
@@ -388,9 +403,8 @@ async def rerun(
         schema_version=schema_version,
     )
     session.add(new_run)
-    await session.flush()
+    # commit() flushes; created_at comes back via INSERT ... RETURNING (eager defaults), no reload
     await session.commit()
-    await session.refresh(new_run)
 
     return RunSummaryResponse(
         id=new_run.id,
@@ -414,22 +428,20 @@ async def get_run(
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    org_id, _ = await require_active_org(current_user, session)
-    result = await session.execute(
-        select(ImportRun)
-        .join(ImportDataset, ImportRun.dataset_id == ImportDataset.id)
-        .where(
-            ImportRun.id == run_id,
-            ImportDataset.org_id == org_id,
-        )
-        .options(selectinload(ImportRun.errors))
-    )
-    run = result.scalar_one_or_none()
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
 
-    errors = sorted(run.errors, key=lambda e: (e.row_number, e.created_at))[:MAX_ERRORS]
-    return RunDetailResponse(
+    # First MAX_ERRORS only, ordered and limited by the (run_id, row_number) index
+    result = await session.execute(
+        select(ImportRowError)
+        .where(ImportRowError.run_id == run_id)
+        .order_by(ImportRowError.row_number, ImportRowError.created_at)
+        .limit(MAX_ERRORS)
+    )
+    errors = result.scalars().all()
+    # Rows come straight from the database: skip per-item validation
+    return RunDetailResponse.model_construct(
         id=run.id,
         dataset_id=run.dataset_id,
         status=run.status.value,
@@ -446,7 +458,7 @@ async def get_run(
         dlq=run.dlq,
         last_error=run.last_error,
         errors=[
-            RowErrorResponse(
+            RowErrorResponse.model_construct(
                 id=e.id,
                 run_id=e.run_id,
                 row_number=e.row_number,
@@ -470,14 +482,29 @@ async def get_run_records(
     min_spend: float | None = Query(None, alias="minSpend"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
+    after_row: int | None = Query(None, ge=0, alias="afterRow"),
 ):
-    """List import records for a run with optional filters and pagination."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    """
+    List import records for a run with optional filters and pagination.
+    Pass afterRow (the previous page's next_after_row) to page by row_number instead of
+    page/offset: deep pages then cost one index range scan instead of skipping every earlier row.
+    """
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
 
-    base = select(ImportRecord).where(ImportRecord.run_id == run_id)
+    # Columns only: no ORM hydration per record
+    base = select(
+        ImportRecord.id,
+        ImportRecord.row_number,
+        ImportRecord.date,
+        ImportRecord.campaign,
+        ImportRecord.channel,
+        ImportRecord.spend,
+        ImportRecord.clicks,
+        ImportRecord.conversions,
+        ImportRecord.created_at,
+    ).where(ImportRecord.run_id == run_id)
     if search:
         base = base.where(ImportRecord.campaign.ilike(f"%{search}%"))
     if channel:
@@ -485,17 +512,35 @@ async def get_run_records(
     if min_spend is not None:
         base = base.where(ImportRecord.spend >= min_spend)
 
-    total = (await session.execute(select(func.count()).select_from(base.subquery()))).scalar() or 0
-
-    q = base.order_by(ImportRecord.row_number).offset((page - 1) * page_size).limit(page_size)
+    if run.status != ImportRunStatus.SUCCEEDED:
+        total = (await session.execute(select(func.count()).select_from(base.subquery()))).scalar() or 0
+    elif not (search or channel or min_spend is not None):
+        # Every valid row of a finished run is a record: the count is already on the run
+        total = run.success_rows
+    else:
+        count_key = (run_id, run.finished_at, search, channel, min_spend)
+        total = _record_count_cache.get(count_key)
+        if total is None:
+            total = (await session.execute(select(func.count()).select_from(base.subquery()))).scalar() or 0
+            if len(_record_count_cache) >= RECORD_COUNT_CACHE_MAX_ENTRIES:
+                _record_count_cache.clear()
+            _record_count_cache[count_key] = total
+
+    q = base.order_by(ImportRecord.row_number).limit(page_size)
+    if after_row is not None:
+        # Keyset: range scan on (run_id, row_number) starting after the last row seen
+        q = q.where(ImportRecord.row_number > after_row)
+    else:
+        q = q.offset((page - 1) * page_size)
     result = await session.execute(q)
-    records = result.scalars().all()
+    records = result.all()
 
-    return RecordsListResponse(
+    # Rows come straight from the database: skip per-item validation
+    return RecordsListResponse.model_construct(
         items=[
-            RecordResponse(
+            RecordResponse.model_construct(
                 id=r.id,
-                run_id=r.run_id,
+                run_id=run_id,
                 row_number=r.row_number,
                 date=r.date.isoformat(),
                 campaign=r.campaign,
@@ -510,53 +555,59 @@ async def get_run_records(
         page=page,
         page_size=page_size,
         total=total,
+        next_after_row=records[-1].row_number if len(records) == page_size else None,
     )
 
 
+# Rows fetched per round trip from the server-side cursor while streaming CSV exports;
+# each fetched batch is written and yielded as one chunk
+CSV_STREAM_YIELD_PER = 1000
+
+
+def _csv_chunk(rows) -> str:
+    """Format rows as CSV. DB row tuples go in as-is: None is written as "" and a
+    date/Decimal as its str(), which is the ISO/plain form the export uses."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue()
+
+
 async def _stream_errors_csv(run_id: UUID):
-    """Yield CSV lines for run errors. Uses its own session for streaming."""
+    """Yield CSV chunks for run errors. Uses its own session, held open while rows stream."""
     from app.db import async_session_factory
+    yield _csv_chunk([["row_number", "field", "message"]])
     async with async_session_factory() as session:
-        result = await session.execute(
-            select(ImportRowError)
+        errors = await session.stream(
+            select(ImportRowError.row_number, ImportRowError.field, ImportRowError.message)
             .where(ImportRowError.run_id == run_id)
             .order_by(ImportRowError.row_number)
+            .execution_options(yield_per=CSV_STREAM_YIELD_PER)
         )
-        errors = result.scalars().all()
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["row_number", "field", "message"])
-    yield buf.getvalue()
-    buf.seek(0)
-    buf.truncate(0)
-    for e in errors:
-        w.writerow([e.row_number, e.field or "", e.message])
-        yield buf.getvalue()
-        buf.seek(0)
-        buf.truncate(0)
+        async for batch in errors.partitions():
+            yield _csv_chunk(batch)
 
 
 async def _stream_records_csv(run_id: UUID):
-    """Yield CSV lines for run records. Uses its own session for streaming."""
+    """Yield CSV chunks for run records. Uses its own session, held open while rows stream."""
     from app.db import async_session_factory
+    yield _csv_chunk([["row_number", "date", "campaign", "channel", "spend", "clicks", "conversions"]])
     async with async_session_factory() as session:
-        result = await session.execute(
-            select(ImportRecord)
+        records = await session.stream(
+            select(
+                ImportRecord.row_number,
+                ImportRecord.date,
+                ImportRecord.campaign,
+                ImportRecord.channel,
+                ImportRecord.spend,
+                ImportRecord.clicks,
+                ImportRecord.conversions,
+            )
             .where(ImportRecord.run_id == run_id)
             .order_by(ImportRecord.row_number)
+            .execution_options(yield_per=CSV_STREAM_YIELD_PER)
         )
-        records = result.scalars().all()
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["row_number", "date", "campaign", "channel", "spend", "clicks", "conversions"])
-    yield buf.getvalue()
-    buf.seek(0)
-    buf.truncate(0)
-    for r in records:
-        w.writerow([r.row_number, r.date.isoformat(), r.campaign, r.channel, str(r.spend), r.clicks, r.conversions])
-        yield buf.getvalue()
-        buf.seek(0)
-        buf.truncate(0)
+        async for batch in records.partitions():
+            yield _csv_chunk(batch)
 
 
 @router.get("/{run_id}/errors.csv")
@@ -566,8 +617,7 @@ async def download_run_errors_csv(
     current_user: User = Depends(get_current_user),
 ):
     """Stream run validation errors as CSV. Requires membership in dataset's org."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     return StreamingResponse(
@@ -586,8 +636,7 @@ async def download_run_records_csv(
     current_user: User = Depends(get_current_user),
 ):
     """Stream run valid records as CSV. Requires membership in dataset's org."""
-    org_id, _ = await require_active_org(current_user, session)
-    run = await _run_in_active_org(session, run_id, org_id)
+    run = await _authorized_run(session, current_user, run_id)
     if not run:
         raise err("not_found", "Run not found", status_code=404)
     return StreamingResponse(
@@ -1,7 +1,7 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
@@ -57,31 +57,36 @@ async def get_active_schema(
 ):
     """Get the active schema version for a dataset."""
     org_id, _ = await require_active_org(current_user, session)
+    # Dataset and its active schema version in one query; no version row -> NULL columns
     result = await session.execute(
-        select(ImportDataset).where(
+        select(
+            ImportDataset.id,
+            DatasetSchemaVersion.version,
+            DatasetSchemaVersion.mapping_json,
+            DatasetSchemaVersion.rules_json,
+        )
+        .outerjoin(
+            DatasetSchemaVersion,
+            and_(
+                DatasetSchemaVersion.dataset_id == ImportDataset.id,
+                DatasetSchemaVersion.version == ImportDataset.active_schema_version,
+            ),
+        )
+        .where(
             ImportDataset.id == dataset_id,
             ImportDataset.org_id == org_id,
         )
     )
-    dataset = result.scalar_one_or_none()
-    if not dataset:
+    row = result.one_or_none()
+    if not row:
         raise err("not_found", "Dataset not found", status_code=404)
-
-    # Get active schema version
-    result = await session.execute(
-        select(DatasetSchemaVersion).where(
-            DatasetSchemaVersion.dataset_id == dataset_id,
-            DatasetSchemaVersion.version == dataset.active_schema_version,
-        )
-    )
-    schema = result.scalar_one_or_none()
-    if not schema:
+    if row.version is None:
         raise err("no_schema", "No schema version found", status_code=404)
 
     return ActiveSchemaResponse(
-        version=schema.version,
-        mapping=schema.mapping_json,
-        rules=schema.rules_json,
+        version=row.version,
+        mapping=row.mapping_json,
+        rules=row.rules_json,
     )
 
 
@@ -136,10 +141,8 @@ async def publish_schema(
 ):
     """Publish a new schema version. Creates version max+1 and sets it as active. Requires ADMIN or OWNER role."""
     await require_dataset_org_admin_or_owner(dataset_id, current_user, session)
-    result = await session.execute(
-        select(ImportDataset).where(ImportDataset.id == dataset_id)
-    )
-    dataset = result.scalar_one_or_none()
+    # Loaded by the permission check: served from the identity map, no query
+    dataset = await session.get(ImportDataset, dataset_id)
     if not dataset:
         raise err("not_found", "Dataset not found", status_code=404)
 
@@ -151,40 +154,39 @@ async def publish_schema(
     if not body.rules or not isinstance(body.rules, dict):
         raise err("invalid_rules", "Rules must be a non-empty object")
 
-    # Get max version
+    # Create version max+1 in one statement: the next number is computed by the INSERT
+    # itself (the unique (dataset_id, version) index rejects a concurrent duplicate)
+    next_version = (
+        select(func.coalesce(func.max(DatasetSchemaVersion.version), 0) + 1)
+        .where(DatasetSchemaVersion.dataset_id == dataset_id)
+        .scalar_subquery()
+    )
     result = await session.execute(
-        select(func.max(DatasetSchemaVersion.version)).where(
-            DatasetSchemaVersion.dataset_id == dataset_id
+        insert(DatasetSchemaVersion)
+        .values(
+            dataset_id=dataset_id,
+            version=next_version,
+            mapping_json=body.mapping,
+            rules_json=body.rules,
+            created_by_user_id=current_user.id,
         )
+        .returning(DatasetSchemaVersion.id, DatasetSchemaVersion.version, DatasetSchemaVersion.created_at)
     )
-    max_version = result.scalar() or 0
-    new_version = max_version + 1
-
-    # Create new schema version
-    schema_version = DatasetSchemaVersion(
-        dataset_id=dataset_id,
-        version=new_version,
-        mapping_json=body.mapping,
-        rules_json=body.rules,
-        created_by_user_id=current_user.id,
-    )
-    session.add(schema_version)
+    created = result.one()
 
     # Update dataset active_schema_version
-    dataset.active_schema_version = new_version
+    dataset.active_schema_version = created.version
     # Also update mapping_json for backward compatibility
     dataset.mapping_json = body.mapping
 
-    await session.flush()
     await session.commit()
-    await session.refresh(schema_version)
 
     return SchemaVersionResponse(
-        id=schema_version.id,
-        dataset_id=schema_version.dataset_id,
-        version=schema_version.version,
-        mapping=schema_version.mapping_json,
-        rules=schema_version.rules_json,
-        created_by_user_id=schema_version.created_by_user_id,
-        created_at=schema_version.created_at.isoformat(),
+        id=created.id,
+        dataset_id=dataset_id,
+        version=created.version,
+        mapping=body.mapping,
+        rules=body.rules,
+        created_by_user_id=current_user.id,
+        created_at=created.created_at.isoformat(),
     )
@@ -6,9 +6,17 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        # Read once at import; nothing may change settings at runtime (cached clients depend on it)
+        frozen=True,
     )
 
     DATABASE_URL: str
+    # Async engine connection pool (per backend process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    DB_POOL_WARM_CONNECTIONS: int = 5  # opened at startup; 0 disables
     REDIS_URL: str
     JWT_SECRET: str
     BACKEND_PORT: int = 8000
@@ -29,6 +37,10 @@ class Settings(BaseSettings):
     # SSE limits
     SSE_MAX_CONCURRENT_PER_USER: int = 3
     SSE_MAX_DURATION_SECONDS: int = 600  # 10 minutes
+    # Admin runs SSE polling fallback (used only when LISTEN/NOTIFY is unavailable)
+    ADMIN_SSE_POLL_MIN_SECONDS: float = 0.5
+    ADMIN_SSE_POLL_MAX_SECONDS: float = 10.0
+    ADMIN_SSE_POLL_BACKOFF_FACTOR: float = 1.5
     # Storage backend: "s3" or "disk"
     STORAGE_BACKEND: str = "disk"
     # S3 / MinIO
@@ -39,6 +51,9 @@ class Settings(BaseSettings):
     S3_REGION: str = "us-east-1"
     S3_USE_SSL: bool = False
     PRESIGN_EXPIRES_SECONDS: int = 900
+    # Disk downloads: when set (e.g. "/_protected/"), hand the file to nginx via X-Accel-Redirect
+    # to this internal location instead of streaming it through the backend
+    DOWNLOAD_X_ACCEL_PREFIX: str | None = None
 
 
 def _resolve_storage_backend() -> str:
@@ -51,5 +66,4 @@ def _resolve_storage_backend() -> str:
     return "disk"
 
 
-settings = Settings()
-settings.STORAGE_BACKEND = _resolve_storage_backend()
+settings = Settings(STORAGE_BACKEND=_resolve_storage_backend())
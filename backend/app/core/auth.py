@@ -11,10 +11,8 @@ from app.models.user import User, UserRole
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
-async def get_current_user(
-    session: AsyncSession = Depends(get_session),
-    token: str | None = Depends(oauth2_scheme),
-) -> User:
+def user_id_from_token(token: str | None) -> UUID:
+    """Decode a bearer token to the user id it was issued for. Raises 401 if invalid."""
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,18 +46,30 @@ async def get_current_user(
                 }
             },
         )
-    result = await session.execute(select(User).where(User.id == UUID(sub)))
+    return UUID(sub)
+
+
+def user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "error": {
+                "code": "user_not_found",
+                "message": "User no longer exists",
+            }
+        },
+    )
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_session),
+    token: str | None = Depends(oauth2_scheme),
+) -> User:
+    user_id = user_id_from_token(token)
+    result = await session.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": {
-                    "code": "user_not_found",
-                    "message": "User no longer exists",
-                }
-            },
-        )
+        raise user_not_found()
     return user
 
 
@@ -3,14 +3,44 @@ Organization context helpers for multi-tenant scoping.
 """
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, oauth2_scheme, user_id_from_token, user_not_found
 from app.db import get_session
 from app.models.user import User
 from app.models.orgs import Organization, OrganizationMember, OrgMemberRole
 
+# Memberships already looked up for this request, keyed by org_id (None = not a member).
+# Kept on the user instance, which get_current_user loads fresh for every request.
+_MEMBERSHIP_CACHE_ATTR = "_org_membership_cache"
+
+
+def _membership_cache(current_user: User) -> dict[UUID, OrganizationMember | None]:
+    cache = getattr(current_user, _MEMBERSHIP_CACHE_ATTR, None)
+    if cache is None:
+        cache = {}
+        setattr(current_user, _MEMBERSHIP_CACHE_ATTR, cache)
+    return cache
+
+
+async def _get_membership(
+    org_id: UUID,
+    current_user: User,
+    session: AsyncSession,
+) -> OrganizationMember | None:
+    """Load the user's membership in org_id, reusing a lookup done earlier in the request."""
+    cache = _membership_cache(current_user)
+    if org_id not in cache:
+        result = await session.execute(
+            select(OrganizationMember).where(
+                OrganizationMember.org_id == org_id,
+                OrganizationMember.user_id == current_user.id,
+            )
+        )
+        cache[org_id] = result.scalar_one_or_none()
+    return cache[org_id]
+
 
 async def get_active_org_id(
     current_user: User = Depends(get_current_user),
@@ -54,13 +84,26 @@ async def require_active_org(
             detail={"error": {"code": "no_active_org", "message": "No active organization"}},
         )
 
-    result = await session.execute(select(Organization).where(Organization.id == org_id))
-    org = result.scalar_one_or_none()
-    if not org:
+    # Load the membership with the org so later role checks in this request skip the query
+    result = await session.execute(
+        select(Organization, OrganizationMember)
+        .outerjoin(
+            OrganizationMember,
+            and_(
+                OrganizationMember.org_id == Organization.id,
+                OrganizationMember.user_id == current_user.id,
+            ),
+        )
+        .where(Organization.id == org_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error": {"code": "org_not_found", "message": "Organization not found"}},
         )
+    org, membership = row
+    _membership_cache(current_user)[org_id] = membership
 
     return (org_id, org)
 
@@ -74,19 +117,76 @@ async def require_org_member(
     Require that user is a member of the specified org.
     Returns the membership. Raises 404 if not a member.
     """
+    membership = await _get_membership(org_id, current_user, session)
+    if not membership:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"code": "not_member", "message": "Not a member of this organization"}},
+        )
+    return membership
+
+
+async def get_org_member(
+    org_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    token: str | None = Depends(oauth2_scheme),
+) -> tuple[User, OrganizationMember]:
+    """
+    Load the current user and their membership in org_id in one query, in place of
+    get_current_user + require_org_member. Raises 401 like get_current_user, 404 if not a member.
+    """
+    user_id = user_id_from_token(token)
     result = await session.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.org_id == org_id,
-            OrganizationMember.user_id == current_user.id,
+        select(User, OrganizationMember)
+        .outerjoin(
+            OrganizationMember,
+            and_(
+                OrganizationMember.user_id == User.id,
+                OrganizationMember.org_id == org_id,
+            ),
         )
+        .where(User.id == user_id)
     )
-    membership = result.scalar_one_or_none()
+    row = result.one_or_none()
+    if not row:
+        raise user_not_found()
+    user, membership = row
+    # Later role checks for this org in the request are served from the cache
+    _membership_cache(user)[org_id] = membership
     if not membership:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error": {"code": "not_member", "message": "Not a member of this organization"}},
         )
-    return membership
+    return (user, membership)
+
+
+async def load_org_if_member(
+    org_id: UUID,
+    current_user: User,
+    session: AsyncSession,
+) -> tuple[Organization, OrganizationMember] | None:
+    """
+    Load an org together with the user's membership in one query.
+    Returns None if the org does not exist or the user is not a member.
+    """
+    result = await session.execute(
+        select(Organization, OrganizationMember)
+        .join(
+            OrganizationMember,
+            and_(
+                OrganizationMember.org_id == Organization.id,
+                OrganizationMember.user_id == current_user.id,
+            ),
+        )
+        .where(Organization.id == org_id)
+    )
+    row = result.one_or_none()
+    _membership_cache(current_user)[org_id] = row[1] if row else None
+    if not row:
+        return None
+    org, membership = row
+    return (org, membership)
 
 
 async def require_org_role(
@@ -119,22 +219,18 @@ async def get_user_org_role(
     session: AsyncSession,
 ) -> OrgMemberRole | None:
     """Get user's role in an org, or None if not a member."""
-    result = await session.execute(
-        select(OrganizationMember.role).where(
-            OrganizationMember.org_id == org_id,
-            OrganizationMember.user_id == current_user.id,
-        )
-    )
-    return result.scalar_one_or_none()
+    membership = await _get_membership(org_id, current_user, session)
+    return membership.role if membership else None
 
 
 async def ensure_personal_org(
     current_user: User,
     session: AsyncSession,
-) -> Organization:
+) -> bool:
     """
-    Ensure user has a personal org. Creates one if needed.
+    Ensure user has a personal org and an active org. Creates one if needed.
     Called during login/bootstrap.
+    Returns True if the user was changed (and committed), False if nothing was needed.
     """
     # Check if user has any memberships
     result = await session.execute(
@@ -146,19 +242,16 @@ async def ensure_personal_org(
 
     if count > 0:
         # User has orgs, ensure active_org_id is set
-        if not current_user.active_org_id:
-            first_result = await session.execute(
-                select(OrganizationMember.org_id)
-                .where(OrganizationMember.user_id == current_user.id)
-                .limit(1)
-            )
-            first_org_id = first_result.scalar_one_or_none()
-            if first_org_id:
-                current_user.active_org_id = first_org_id
-                await session.commit()
-                await session.refresh(current_user)
-                result = await session.execute(select(Organization).where(Organization.id == first_org_id))
-                return result.scalar_one()
+        if current_user.active_org_id:
+            return False
+        first_result = await session.execute(
+            select(OrganizationMember.org_id)
+            .where(OrganizationMember.user_id == current_user.id)
+            .limit(1)
+        )
+        current_user.active_org_id = first_result.scalar_one()
+        await session.commit()
+        return True
 
     # Create personal org
     from uuid import uuid4
@@ -180,6 +273,5 @@ async def ensure_personal_org(
 
     current_user.active_org_id = org.id
     await session.commit()
-    await session.refresh(org)
 
-    return org
+    return True
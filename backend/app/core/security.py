@@ -1,4 +1,8 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -15,6 +19,24 @@ def verify_password(plain: str, password_hash: str) -> bool:
     return pwd_context.verify(plain, password_hash)
 
 
+# bcrypt is deliberately slow CPU work; request handlers run it here instead of on the
+# event loop. Sized to the cores so hashing cannot starve the default to_thread pool.
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+
+async def hash_password_async(plain: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, plain)
+
+
+async def verify_password_async(plain: str, password_hash: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain, password_hash)
+
+
 def create_access_token(sub: str, role: str, email: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_ACCESS_EXPIRES_MINUTES)
     payload = {
@@ -2,7 +2,6 @@
 Server-Sent Events helpers for streaming ImportRun progress.
 """
 import asyncio
-import json
 import logging
 import os
 import time
@@ -11,6 +10,7 @@ from datetime import datetime, timezone
 from threading import Lock
 from uuid import UUID
 
+import orjson
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -44,9 +44,9 @@ POLL_INTERVAL = 1.0
 HEARTBEAT_INTERVAL = 15.0
 
 
-def sse_event(event: str, data: dict) -> str:
-    """Format a single SSE message: event + data + double newline."""
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+def sse_event(event: str, data: dict) -> bytes:
+    """Format a single SSE message: event + data + double newline, JSON-encoded with orjson."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, option=orjson.OPT_NAIVE_UTC) + b"\n\n"
 
 
 def _run_payload(run: ImportRun) -> dict:
@@ -96,7 +96,7 @@ def _decrement_sse_connection(user_id: UUID) -> None:
             _sse_connections.pop(user_id, None)
 
 
-async def stream_run_events(run_id: UUID, user_id: UUID) -> AsyncGenerator[str, None]:
+async def stream_run_events(run_id: UUID, user_id: UUID) -> AsyncGenerator[bytes, None]:
     """
     Async generator that yields SSE-formatted strings for run progress.
     - Checks authorization (user must own run or be admin).
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from uuid import UUID
 
@@ -25,7 +26,7 @@ class InvalidFileError(Exception):
 class UploadResult:
     """Result of file upload with metadata."""
 
-    def __init__(self, file_path: str | None, sha256: str, size_bytes: int, storage: str = "disk", s3_bucket: str | None = None, s3_key: str | None = None):
+    def __init__(self, file_path: str | None, sha256: bytes, size_bytes: int, storage: str = "disk", s3_bucket: str | None = None, s3_key: str | None = None):
         self.file_path = file_path
         self.sha256 = sha256
         self.size_bytes = size_bytes
@@ -34,7 +35,10 @@ class UploadResult:
         self.s3_key = s3_key
 
 
+@lru_cache(maxsize=1)
 def _get_storage_backend():
+    """Storage backend for this process. Built once: S3Storage creates a boto3 client and
+    checks the bucket, which must not happen per request."""
     if settings.STORAGE_BACKEND == "s3" and settings.S3_ENDPOINT_URL and settings.S3_ACCESS_KEY and settings.S3_SECRET_KEY:
         return S3Storage(
             endpoint_url=settings.S3_ENDPOINT_URL,
@@ -141,8 +145,6 @@ def read_csv_header(file_path: str) -> list[str]:
     Read first line of CSV and return column names. Raises if file missing or empty.
     Validates column count and field length limits.
     """
-    from app.config import settings
-
     path = resolve_run_file_path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
@@ -16,11 +16,15 @@ class StoredObject:
     bucket: str | None  # for s3
     key: str | None  # for s3
     size_bytes: int
-    sha256: str
+    sha256: bytes  # raw digest
 
 
 UPLOAD_ROOT = Path(__file__).resolve().parent.parent.parent / "storage" / "uploads"
 
+# Uploads are read, hashed and written in 1 MiB pieces: per-call overhead of
+# read()/update()/write() dominates with smaller buffers
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
 
 class DiskStorage:
     """Store uploads to local disk."""
@@ -41,7 +45,7 @@ class DiskStorage:
         total_size = 0
 
         with open(file_path, "wb") as f:
-            while chunk := await file.read(1024 * 64):
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
                 total_size += len(chunk)
                 if total_size > max_size:
                     if file_path.exists():
@@ -52,7 +56,7 @@ class DiskStorage:
                 sha256_hash.update(chunk)
                 f.write(chunk)
 
-        sha256_hex = sha256_hash.hexdigest()
+        sha256_digest = sha256_hash.digest()
         relative_path = f"storage/uploads/{dataset_id}/{run_id}.csv"
         return StoredObject(
             storage="disk",
@@ -60,7 +64,7 @@ class DiskStorage:
             bucket=None,
             key=None,
             size_bytes=total_size,
-            sha256=sha256_hex,
+            sha256=sha256_digest,
         )
 
 
@@ -104,7 +108,7 @@ class S3Storage:
         total_size = 0
         chunks = []
 
-        while chunk := await file.read(1024 * 64):
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
             total_size += len(chunk)
             if total_size > max_size:
                 raise ValueError(
@@ -114,7 +118,7 @@ class S3Storage:
             chunks.append(chunk)
 
         body = b"".join(chunks)
-        sha256_hex = sha256_hash.hexdigest()
+        sha256_digest = sha256_hash.digest()
 
         def _upload():
             self.client.put_object(
@@ -132,7 +136,7 @@ class S3Storage:
             bucket=self.bucket,
             key=key,
             size_bytes=total_size,
-            sha256=sha256_hex,
+            sha256=sha256_digest,
         )
 
     def presign_download(self, bucket: str, key: str, expires: int) -> str:
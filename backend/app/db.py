@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -7,6 +8,10 @@ from app.models.base import Base
 
 engine = create_async_engine(
     settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
     pool_pre_ping=True,
     echo=settings.ENV == "dev",
 )
@@ -32,6 +37,19 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def warm_up_pool(connections: int) -> None:
+    """
+    Open `connections` pool connections concurrently (SELECT 1 on each) so the
+    first requests after startup don't pay the connect/auth handshake.
+    """
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(connections)))
+
+
 async def check_db() -> tuple[bool, float]:
     """Run a simple SELECT 1 and return (ok, latency_ms)."""
     import time
@@ -1,6 +1,7 @@
 import logging
 from sqlalchemy import select, func
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app_shared.otel import init_otel
@@ -13,7 +14,7 @@ from app.core.demo_seed import seed_demo
 from app.core.logging import LoggingMiddleware
 from app.core.org_context import ensure_personal_org
 from app.core.security import hash_password
-from app.db import async_session_factory
+from app.db import async_session_factory, warm_up_pool
 from app.models.user import User, UserRole
 
 logging.basicConfig(
@@ -25,9 +26,22 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="ETL Studio API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 
+@app.on_event("startup")
+async def warm_db_pool() -> None:
+    """Prime the DB connection pool; a failure here is logged, not fatal."""
+    warm = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    if warm <= 0:
+        return
+    try:
+        await warm_up_pool(warm)
+    except Exception as e:
+        logger.warning("DB pool warm-up failed: %s", e)
+
+
 @app.on_event("startup")
 async def bootstrap_admin() -> None:
     """Create admin user from env if no users exist (for initial provisioning)."""
@@ -5,7 +5,9 @@ from app_shared.models.imports import (
     ImportRunAttemptStatus,
     ImportRowError,
     ImportRecord,
+    ImportRecordRollup,
     ImportRunStatus,
+    ImportRunStatusCode,
     DatasetSchemaVersion,
 )
 
@@ -16,6 +18,8 @@ __all__ = [
     "ImportRunAttemptStatus",
     "ImportRowError",
     "ImportRecord",
+    "ImportRecordRollup",
     "ImportRunStatus",
+    "ImportRunStatusCode",
     "DatasetSchemaVersion",
 ]
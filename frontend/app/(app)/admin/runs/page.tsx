@@ -26,7 +26,9 @@ type AdminRunsResponse = {
   items: AdminRunItem[];
   page: number;
   page_size: number;
-  total: number;
+  // null when paging by cursor; 0 on a page past the end (window count over no rows)
+  total: number | null;
+  next_cursor?: string | null;
 };
 
 const STATUS_OPTIONS = [
@@ -120,7 +122,9 @@ export default function AdminRunsPage() {
   }
 
   const items = data?.items ?? [];
-  const total = data?.total ?? 0;
+  const total = data?.total ?? null;
+  const totalPages = total ? Math.ceil(total / pageSize) : null;
+  const hasNextPage = totalPages != null ? page < totalPages : items.length === pageSize;
 
   return (
     <div className="space-y-4">
@@ -274,7 +278,7 @@ export default function AdminRunsPage() {
         )}
       </div>
 
-      {total > pageSize && (
+      {(page > 1 || hasNextPage) && (
         <div className="flex items-center gap-2 text-sm">
           <button
             type="button"
@@ -285,12 +289,13 @@ export default function AdminRunsPage() {
             Previous
           </button>
           <span className="text-gray-600">
-            Page {page} of {Math.ceil(total / pageSize)}
+            Page {page}
+            {totalPages != null && ` of ${totalPages}`}
           </span>
           <button
             type="button"
             className="rounded border border-gray-300 px-2 py-1 disabled:opacity-50"
-            disabled={page >= Math.ceil(total / pageSize)}
+            disabled={!hasNextPage}
             onClick={() => setPage((p) => p + 1)}
           >
             Next
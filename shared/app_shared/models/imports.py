@@ -3,9 +3,25 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Numeric,
+    SmallInteger,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
 from app_shared.models.base import Base, TimestampMixin
 
@@ -21,6 +37,33 @@ class ImportRunStatus(str, enum.Enum):
     FAILED = "FAILED"
 
 
+class ImportRunStatusCode(enum.IntEnum):
+    """On-disk SMALLINT code for each ImportRunStatus. Append new codes; never renumber."""
+
+    DRAFT = 0
+    QUEUED = 1
+    RUNNING = 2
+    SUCCEEDED = 3
+    FAILED = 4
+
+
+class ImportRunStatusType(TypeDecorator):
+    """Stores ImportRunStatus as its ImportRunStatusCode; Python code keeps using ImportRunStatus."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return ImportRunStatusCode[ImportRunStatus(value).name].value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return ImportRunStatus[ImportRunStatusCode(value).name]
+
+
 class ImportRunAttemptStatus(str, enum.Enum):
     STARTED = "STARTED"
     SUCCEEDED = "SUCCEEDED"
@@ -70,23 +113,24 @@ class ImportRun(Base, TimestampMixin):
         nullable=False,
     )
     status: Mapped[ImportRunStatus] = mapped_column(
-        Enum(ImportRunStatus),
+        ImportRunStatusType(),
         nullable=False,
         default=ImportRunStatus.DRAFT,
+        server_default=text("0"),
     )
     schema_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     file_storage: Mapped[str] = mapped_column(String(16), default="disk", nullable=False)
     file_path: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     s3_bucket: Mapped[str | None] = mapped_column(String(255), nullable=True)
     s3_key: Mapped[str | None] = mapped_column(String(1024), nullable=True)
-    file_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    file_sha256: Mapped[bytes | None] = mapped_column(LargeBinary(32), nullable=True, index=True)
     file_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     row_limit_exceeded: Mapped[bool] = mapped_column(default=False, nullable=False)
     progress_percent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    total_rows: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    processed_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    success_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    error_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_rows: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    processed_rows: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    success_rows: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    error_rows: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     error_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -95,8 +139,34 @@ class ImportRun(Base, TimestampMixin):
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     __table_args__ = (
-        Index("ix_import_runs_dataset_id_created_at", "dataset_id", "created_at"),
+        Index(
+            "ix_import_runs_dataset_id_created_at",
+            "dataset_id",
+            text("created_at DESC"),
+            postgresql_include=["status", "progress_percent", "processed_rows", "total_rows"],
+        ),
         Index("ix_import_runs_status_created_at", "status", "created_at"),
+        Index("ix_import_runs_dlq", "dlq", postgresql_where=text("dlq")),
+        Index(
+            "ix_import_runs_dataset_id_sha256_succeeded",
+            "dataset_id",
+            "file_sha256",
+            postgresql_where=text("status = 3"),
+        ),
+        Index("ix_import_runs_updated_at_id", text("updated_at DESC"), text("id DESC")),
+        Index(
+            "ix_import_runs_dataset_id_updated_at",
+            "dataset_id",
+            text("updated_at DESC"),
+            postgresql_include=[
+                "status",
+                "progress_percent",
+                "processed_rows",
+                "total_rows",
+                "attempt_count",
+                "dlq",
+            ],
+        ),
     )
 
     dataset: Mapped["ImportDataset"] = relationship("ImportDataset", back_populates="runs")
@@ -147,7 +217,6 @@ class ImportRunAttempt(Base):
     )
 
     __table_args__ = (
-        Index("ix_import_run_attempts_run_id", "run_id"),
         Index("ix_import_run_attempts_attempt_number", "run_id", "attempt_number"),
     )
 
@@ -167,7 +236,7 @@ class ImportRowError(Base):
         ForeignKey("import_runs.id", ondelete="CASCADE"),
         nullable=False,
     )
-    row_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    row_number: Mapped[int] = mapped_column(BigInteger, nullable=False)
     field: Mapped[str | None] = mapped_column(String(255), nullable=True)
     message: Mapped[str] = mapped_column(String(1024), nullable=False)
     raw_row: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
@@ -177,7 +246,9 @@ class ImportRowError(Base):
         nullable=False,
     )
 
-    __table_args__ = (Index("ix_import_row_errors_run_id_row_number", "run_id", "row_number"),)
+    __table_args__ = (
+        Index("ix_import_row_errors_run_id_row_number", "run_id", "row_number"),
+    )
 
     run: Mapped["ImportRun"] = relationship("ImportRun", back_populates="errors")
 
@@ -190,12 +261,13 @@ class ImportRecord(Base):
         primary_key=True,
         default=uuid.uuid4,
     )
+    # Partition key (HASH), so it is part of the primary key
     run_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("import_runs.id", ondelete="CASCADE"),
-        nullable=False,
+        primary_key=True,
     )
-    row_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    row_number: Mapped[int] = mapped_column(BigInteger, nullable=False)
     date: Mapped[date] = mapped_column(Date, nullable=False)
     campaign: Mapped[str] = mapped_column(String(512), nullable=False)
     channel: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -210,15 +282,62 @@ class ImportRecord(Base):
 
     __table_args__ = (
         Index("ix_import_records_run_id_row_number", "run_id", "row_number"),
-        Index("ix_import_records_run_id_campaign", "run_id", "campaign"),
+        Index(
+            "ix_import_records_run_id_campaign",
+            "run_id",
+            "campaign",
+            postgresql_include=["spend", "clicks", "conversions"],
+        ),
+        Index(
+            "ix_import_records_run_id_date",
+            "run_id",
+            "date",
+            postgresql_include=["channel", "campaign", "spend", "clicks", "conversions"],
+        ),
+        Index(
+            "ix_import_records_campaign_trgm",
+            "campaign",
+            postgresql_using="gin",
+            postgresql_ops={"campaign": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "HASH (run_id)"},
     )
 
     run: Mapped["ImportRun"] = relationship("ImportRun", back_populates="records")
 
 
-class DatasetSchemaVersion(Base, TimestampMixin):
+class ImportRecordRollup(Base):
+    """
+    ImportRecord sums per (run, date, channel, campaign) for analytics.
+    Maintained by statement-level triggers on import_records (alembic 022); never written by the app.
+    """
+
+    __tablename__ = "import_record_rollups"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("import_runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    channel: Mapped[str] = mapped_column(String(255), primary_key=True)
+    campaign: Mapped[str] = mapped_column(String(512), primary_key=True)
+    spend: Mapped[Decimal] = mapped_column(Numeric(20, 2), nullable=False)
+    clicks: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    conversions: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    record_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class DatasetSchemaVersion(Base):
+    """Immutable snapshot of a dataset's mapping and rules; no updated_at by design."""
+
     __tablename__ = "dataset_schema_versions"
 
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
     dataset_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("import_datasets.id", ondelete="CASCADE"),
@@ -232,6 +351,11 @@ class DatasetSchemaVersion(Base, TimestampMixin):
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
 
     __table_args__ = (
         Index("ix_dataset_schema_versions_dataset_version", "dataset_id", "version", unique=True),
@@ -1,7 +1,7 @@
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy import Enum, ForeignKey, Index, String, DateTime, func
+from sqlalchemy import Enum, ForeignKey, Index, String, DateTime, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -66,6 +66,7 @@ class OrganizationMember(Base):
     __table_args__ = (
         Index("ix_organization_members_org_user", "org_id", "user_id", unique=True),
         Index("ix_organization_members_user", "user_id"),
+        Index("ix_organization_members_org_created_at", "org_id", text("created_at DESC")),
     )
 
     organization: Mapped["Organization"] = relationship("Organization", back_populates="members")
@@ -105,7 +106,7 @@ class OrganizationInvite(Base):
     )
 
     __table_args__ = (
-        Index("ix_organization_invites_org", "org_id"),
+        Index("ix_organization_invites_org_created_at", "org_id", text("created_at DESC")),
         Index("ix_organization_invites_expires", "expires_at"),
     )
 